@@ -0,0 +1,224 @@
+"""
+Export benchmarks for the banner renderer.
+
+Usage:
+    python bench_export.py gif_memory     # peak RSS of a GIF export vs duration
+    python bench_export.py render_engine  # numpy vs PIL engine (checks they match first)
+    python bench_export.py gif_encode     # adaptive vs fixed-palette GIF encoding
+    python bench_export.py mp4_convert    # RGBA -> BGR frame conversion for MP4
+    python bench_export.py worker_transport  # pickled vs shared-memory frames from workers
+    python bench_export.py font_lookup    # font registry load + lookup time
+
+Each measurement runs in a fresh child process so peak RSS isn't shared
+between runs. Peak RSS needs the `resource` module (Linux/macOS).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from PIL import Image
+
+from payday_banner import (
+    BannerRenderer, FontRegistry, FrameRing, GifWriter, Mp4Writer, font_key, render_frames,
+)
+
+
+BENCH_CONFIG = {
+    'custom_text': 'POLICE ASSAULT IN PROGRESS',
+    'threat_level': 'Death Wish (5 skulls)',
+    'color': '#FFEF00',
+    'bg_color_1': '#C4B500',
+    'bg_color_2': '#645C00',
+    'start_flicker': True,
+    'start_flicker_duration': 2.0,
+    'bg_flicker_speed': 1.0,
+}
+
+
+def peak_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_gif_export(duration, fps=30, width=1280, height_mode='fixed'):
+    renderer = BannerRenderer(BENCH_CONFIG)
+    plan = renderer.compile_plan(width, height_mode, 10)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.gif")
+        start = time.perf_counter()
+        writer = GifWriter(path, (plan.canvas_width, plan.canvas_height), int(1000 / fps))
+        for i in range(int(duration * fps)):
+            writer.write(renderer.draw_frame(i / fps, plan))
+        writer.close()
+        elapsed = time.perf_counter() - start
+        size_kb = os.path.getsize(path) / 1024
+
+    print(f"{duration},{elapsed:.2f},{size_kb:.0f},{peak_rss_mb():.1f}")
+
+
+def gif_memory(durations=(5, 10, 20, 40)):
+    print(f"{'duration (s)':>12} {'time (s)':>10} {'size (KB)':>10} {'peak RSS (MB)':>14}")
+    for duration in durations:
+        out = subprocess.run(
+            [sys.executable, __file__, '_gif_child', str(duration)],
+            capture_output=True, text=True, check=True).stdout.strip()
+        dur, elapsed, size_kb, rss = out.split(',')
+        print(f"{dur:>12} {elapsed:>10} {size_kb:>10} {rss:>14}")
+
+
+def check_engines_match(plans, times):
+    """Both engines have to draw the very same pixels, intro and steady frames alike."""
+    import numpy as np
+    pil = BannerRenderer(dict(BENCH_CONFIG, render_engine='pil'))
+    vec = BannerRenderer(dict(BENCH_CONFIG, render_engine='numpy'))
+    for width, height_mode in plans:
+        plan = pil.compile_plan(width, height_mode, 10)
+        for band in (False, True):
+            arrays = vec.render_arrays(times, plan, band)
+            for t, array in zip(times, arrays):
+                assert (array == np.asarray(pil.draw_frame(t, plan, band))).all(), \
+                    f"numpy != PIL at {width} px {height_mode}, t={t}, band={band}"
+
+
+def render_engine(count=120, fps=30, plans=((1280, 'fit'), (1920, 'fixed'), (960, 'fixed'))):
+    # Intro (blinking, banner growing) through to the steady scroll and flicker
+    check_engines_match(plans, [i / 10 for i in range(60)])
+    
+    print(f"{count} frames each, both engines match")
+    print(f"{'size':>11} {'engine':>7} {'ms/frame':>9}")
+    for width, height_mode in plans:
+        for engine in ('pil', 'numpy'):
+            renderer = BannerRenderer(dict(BENCH_CONFIG, render_engine=engine))
+            plan = renderer.compile_plan(width, height_mode, 10)
+            start = time.perf_counter()
+            renderer.render_arrays([3 + i / fps for i in range(count)], plan)
+            elapsed = time.perf_counter() - start
+            print(f"{plan.canvas_width:>5}x{plan.canvas_height:<5} {engine:>7} {elapsed / count * 1000:>9.2f}")
+
+
+def gif_encode(duration=6, fps=25, width=1280, height_mode='fit'):
+    renderer = BannerRenderer(BENCH_CONFIG)
+    plan = renderer.compile_plan(width, height_mode, 10)
+    frames = [renderer.draw_frame(i / fps, plan) for i in range(int(duration * fps))]
+
+    print(f"{len(frames)} frames, {plan.canvas_width}x{plan.canvas_height}")
+    print(f"{'palette':>10} {'encode (s)':>11} {'size (KB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, palette in (('adaptive', None), ('fixed', renderer.build_gif_palette(plan))):
+            path = os.path.join(tmp, f"{name}.gif")
+            start = time.perf_counter()
+            writer = GifWriter(path, (plan.canvas_width, plan.canvas_height), int(1000 / fps), palette=palette)
+            for frame in frames:
+                writer.write(frame)
+            writer.close()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10} {elapsed:>11.2f} {os.path.getsize(path) / 1024:>10.0f}")
+
+
+def legacy_frame_to_bgr(img):
+    """The old MP4 frame path: new RGB image, masked paste, np.array, reversed copy."""
+    import numpy as np
+    bg = Image.new("RGB", img.size, (0, 0, 0))
+    bg.paste(img, mask=img.split()[3])
+    return np.array(bg)[:, :, ::-1].copy()
+
+
+def mp4_convert(count=120, fps=30, width=1920, height_mode='fixed'):
+    import numpy as np
+    renderer = BannerRenderer(dict(BENCH_CONFIG, render_engine='numpy'))
+    plan = renderer.compile_plan(width, height_mode, 10)
+    frames = renderer.render_arrays([3 + i / fps for i in range(count)], plan)
+    images = [Image.fromarray(f, 'RGBA') for f in frames]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = Mp4Writer(os.path.join(tmp, "bench.mp4"), fps, (plan.canvas_width, plan.canvas_height))
+        bgr = np.zeros((plan.canvas_height, plan.canvas_width, 3), np.uint8)
+        to_bgr = lambda frame: writer.to_bgr(frame, bgr)
+        assert all((to_bgr(f) == legacy_frame_to_bgr(img)).all() for f, img in zip(frames[:8], images))
+        
+        print(f"{count} frames, {plan.canvas_width}x{plan.canvas_height}")
+        print(f"{'path':>22} {'ms/frame':>9} {'numpy MB allocated/frame':>25}")
+        # tracemalloc sees numpy's buffers (not PIL's), so the legacy number is a lower bound
+        for name, convert, inputs in (('legacy (PIL paste)', legacy_frame_to_bgr, images),
+                                      ('Mp4Writer.to_bgr', to_bgr, frames)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            allocated = 0
+            for frame in inputs:
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                convert(frame)
+                allocated += tracemalloc.get_traced_memory()[1] - before
+            elapsed = time.perf_counter() - start
+            tracemalloc.stop()
+            print(f"{name:>22} {elapsed / count * 1000:>9.2f} {allocated / count / 2**20:>25.2f}")
+        writer.close()
+
+
+def worker_transport(count=240, fps=30, workers=2, widths=(1280, 4096), height_mode='fixed'):
+    renderer = BannerRenderer(dict(BENCH_CONFIG, render_engine='numpy'))
+    print(f"{count} mp4 frames, {workers} workers")
+    print(f"{'size':>11} {'transport':>10} {'ms/frame':>9}")
+    for width in widths:
+        plan = renderer.compile_plan(width, height_mode, 10)
+        times = [3 + i / fps for i in range(count)]
+        for name in ('pickle', 'shm ring'):
+            ring = FrameRing.for_plan(plan, workers * 2, hold=1) if name == 'shm ring' else None
+            start = time.perf_counter()
+            for frame in render_frames(renderer, plan, times, 'mp4', workers, ring=ring):
+                frame[0, 0, 0]
+            elapsed = time.perf_counter() - start
+            if ring is not None:
+                ring.close()
+            print(f"{plan.canvas_width:>5}x{plan.band_height:<5} {name:>10} {elapsed / count * 1000:>9.2f}")
+
+
+def font_lookup(rounds=1000):
+    start = time.perf_counter()
+    registry = FontRegistry()
+    load = time.perf_counter() - start
+    
+    # A font's own file name has to find that very file, not another face
+    # of its family (e.g. DejaVuSans.ttf vs DejaVuSans-Bold.ttf)
+    keys = [font_key(f['path']) for f in registry.fonts]
+    for f in registry.fonts:
+        if keys.count(font_key(f['path'])) == 1:
+            name = os.path.basename(f['path'])
+            assert registry.find(name) == f['path'], f"{name} -> {registry.find(name)}"
+    
+    names = registry.families() + [os.path.basename(f['path']) for f in registry.fonts]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        registry.resolved.clear()
+        for name in names:
+            registry.find(name)
+    elapsed = time.perf_counter() - start
+    print(f"{len(registry.fonts)} fonts, registry load {load * 1000:.1f} ms, "
+          f"find() {elapsed / (rounds * len(names)) * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else 'gif_memory'
+    if cmd == '_gif_child':
+        run_gif_export(float(sys.argv[2]))
+    elif cmd == 'gif_memory':
+        gif_memory()
+    elif cmd == 'render_engine':
+        render_engine()
+    elif cmd == 'gif_encode':
+        gif_encode()
+    elif cmd == 'mp4_convert':
+        mp4_convert()
+    elif cmd == 'worker_transport':
+        worker_transport()
+    elif cmd == 'font_lookup':
+        font_lookup()
+    else:
+        print(__doc__)
+        sys.exit(1)
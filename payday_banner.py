@@ -1,15 +1,25 @@
-import tkinter as tk
-from tkinter import ttk, colorchooser, filedialog, messagebox
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-import cv2
-import numpy as np
-import threading
 import time
+_IMPORT_START = time.perf_counter()
+
+from PIL import Image, ImageDraw, ImageFont, GifImagePlugin
+import threading
+import queue
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import math
 import os
 import sys
 import re
+import json
+import argparse
+import struct
+import tempfile
 from datetime import datetime
+from dataclasses import dataclass, replace
+from fractions import Fraction
+# cv2 and numpy are imported inside the functions that need them: they take
+# a good while to load and aren't needed to open the window or render with PIL
 
 # Directory Constants
 BASE_DIR = os.path.dirname(os.path.abspath(__file__)) 
@@ -44,7 +54,403 @@ def generate_export_filename(banner_text, fmt):
     return f"{base_name}_{timestamp}.{fmt}"
 
 
-class BannerRenderer: 
+def auto_bg_colors(main_hex):
+    """Generate background flicker colors from main color. Returns (bg1_hex, bg2_hex)."""
+    # Convert to RGB
+    r = int(main_hex[1:3], 16)
+    g = int(main_hex[3:5], 16)
+    b = int(main_hex[5:7], 16)
+    
+    # BG Pulse A: 80% brightness
+    bg1_r = int(r * 0.80)
+    bg1_g = int(g * 0.80)
+    bg1_b = int(b * 0.80)
+    
+    # BG Pulse B: 40% brightness
+    bg2_r = int(r * 0.40)
+    bg2_g = int(g * 0.40)
+    bg2_b = int(b * 0.40)
+    
+    bg1_hex = '#{:02x}{:02x}{:02x}'.format(bg1_r, bg1_g, bg1_b)
+    bg2_hex = '#{:02x}{:02x}{:02x}'.format(bg2_r, bg2_g, bg2_b)
+    return bg1_hex, bg2_hex
+
+
+def scale_px(value, scale):
+    """Scale a pixel size for a plan drawn at `scale` (never below 1px, untouched at 1.0)."""
+    if scale == 1:
+        return value
+    return max(1, round(value * scale))
+
+
+def snap_int(value):
+    """
+    int() that doesn't drop a whole step to float noise: (i / fps - start) * speed
+    lands on exact integers a lot, and 109.99999999999999 should still be 110.
+    Keeps frames that are a whole loop apart pixel-identical.
+    """
+    return int(value + 1e-6)
+
+
+def flicker_rate(speed):
+    """
+    Background flicker speed as rendered: snapped to the 0.1 steps the GUI
+    shows, and kept as an exact Fraction so the loop solver works with the
+    very value frames are drawn with.
+    """
+    return Fraction(round(speed * 10), 10)
+
+
+DEFAULT_CONFIG = {
+    'custom_text': 'POLICE ASSAULT IN PROGRESS',
+    'threat_level': 'Normal (1 skull)',
+    'color': '#FFEF00',
+    'bg_color_1': '#C4B500',
+    'bg_color_2': '#645C00',
+    'auto_bg_color': True,  # Auto-generate background colors from main color
+    'start_flicker': True,
+    'start_flicker_duration': 2.0,  # Duration of the blinking intro animation
+    'bg_flicker_speed': 1.0,
+    'canvas_width': 720,
+    'canvas_height_mode': 'fit',
+    'fit_padding': 10,
+    'render_engine': 'numpy',
+    'font': ''  # Family name, file name or path - empty uses the fallback chain
+}
+
+# Banner geometry / animation constants
+BANNER_HEIGHT = 80
+INDICATOR_SIZE = 60
+FONT_SIZE = 40
+SCROLL_SPEED = 200  # px per second
+EXPAND_DURATION = 0.45  # Banner expand animation duration
+
+# Every mask value 0..255, for building text colour lookup tables
+MASK_RAMP = Image.frombytes('L', (256, 1), bytes(range(256)))
+
+# Config keys grouped by the part of a RenderPlan they feed, so a config
+# change only recompiles what it touches (see BannerRenderer.update_plan)
+COLOUR_KEYS = frozenset(('color', 'bg_color_1', 'bg_color_2'))
+TEXT_KEYS = frozenset(('custom_text', 'threat_level', 'font'))
+TIMING_KEYS = frozenset(('start_flicker', 'start_flicker_duration', 'bg_flicker_speed'))
+LAYOUT_KEYS = frozenset(('canvas_width', 'canvas_height_mode', 'fit_padding'))
+
+# Frames per task handed to the render engine / export workers
+RENDER_BATCH_SIZE = 8
+
+# Frames each ExportPipeline queue holds between two stages
+EXPORT_QUEUE_SIZE = 8
+
+# Max memory spent caching one loop period of frames during export; the
+# rest of a longer loop spills to a temp file, up to LOOP_SPILL_LIMIT
+LOOP_CACHE_BUDGET = 512 * 1024 * 1024
+LOOP_SPILL_LIMIT = 4 * 1024 * 1024 * 1024
+
+# Auto loop length may change the scroll speed by up to this fraction to
+# get a short loop that is still a whole number of frames
+LOOP_NUDGE = 0.02
+
+# Longest export the GUI offers; auto loops are capped to it too
+MAX_EXPORT_SECONDS = 300
+
+# Fastest GIF frame rate: 2 cs delays (see GifClock)
+GIF_MAX_FPS = 50
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+
+# Style names fonts use for their plain face
+REGULAR_STYLES = ('regular', 'normal', 'book', 'roman', 'medium', '')
+
+
+def font_cache_path():
+    """Where the font index is kept between runs (per user, not next to the script)."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'PaydayBannerGenerator', 'font_index.json')
+
+
+def system_font_dirs():
+    """Font directories for this platform (only the ones that exist)."""
+    home = os.path.expanduser('~')
+    if sys.platform == 'win32':
+        windir = os.environ.get('WINDIR', r'C:\Windows')
+        dirs = [os.path.join(windir, 'Fonts')]
+        if os.environ.get('LOCALAPPDATA'):
+            dirs.append(os.path.join(os.environ['LOCALAPPDATA'], 'Microsoft', 'Windows', 'Fonts'))
+    elif sys.platform == 'darwin':
+        dirs = ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    else:
+        data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(home, '.local', 'share')
+        dirs = [os.path.join(data_home, 'fonts'), os.path.join(home, '.fonts')]
+        for d in (os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share').split(':'):
+            if d:
+                dirs.append(os.path.join(d, 'fonts'))
+    return [d for d in dict.fromkeys(dirs) if os.path.isdir(d)]
+
+
+def font_key(name):
+    """Normalise a family / file name for lookups: 'Arial Bold.ttf' -> 'arialbold'."""
+    name = os.path.basename(name).lower()
+    root, ext = os.path.splitext(name)
+    if ext in FONT_EXTENSIONS:
+        name = root
+    return re.sub(r'[\s_-]+', '', name)
+
+
+class FontRegistry:
+    """
+    Index of installed fonts: family name / file name -> path.
+    
+    Scanning (and opening every font to read its name) is slow, so the system
+    font index is saved to font_cache_path() along with the mtime of every
+    directory that was scanned, and only rebuilt when one of those changed.
+    Local fonts - .ttf files in the working directory or next to the script -
+    are re-listed every time (the working directory changes from run to run)
+    and win over system fonts; their names are cached by path and mtime.
+    Use get_font_registry() rather than building one.
+    """
+    VERSION = 2
+    
+    def __init__(self, cache_path=None, system_dirs=None, local_dirs=None):
+        self.cache_path = cache_path or font_cache_path()
+        self.system_dirs = system_font_dirs() if system_dirs is None else system_dirs
+        self.local_dirs = list(dict.fromkeys(local_dirs or [os.getcwd(), BASE_DIR]))
+        self.fonts = []  # [{'path', 'family', 'style', 'local'}]
+        self.dirs = {}
+        self.local_names = {}  # path -> {'mtime', 'family', 'style'} for local fonts
+        self.files = {}
+        self.index = {}
+        self.resolved = {}
+        
+        cached = self.load_cache()
+        if not cached:
+            self.scan()
+        if self.scan_local() or not cached:
+            self.save_cache()
+        self.build_index()
+    
+    def dir_mtimes(self, dirs):
+        mtimes = {}
+        for d in dirs:
+            try:
+                mtimes[d] = os.stat(d).st_mtime
+            except OSError:
+                mtimes[d] = None
+        return mtimes
+    
+    def load_cache(self):
+        """Load the saved system font index. False if it's missing, unreadable or out of date."""
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except:
+            return False
+        
+        if data.get('version') != self.VERSION:
+            return False
+        # Local font names are still worth having even if the rest is stale
+        self.local_names = data.get('local', {})
+        if data.get('roots') != self.system_dirs:
+            return False
+        # Adding/removing a font changes the mtime of the directory it's in
+        dirs = data.get('dirs', {})
+        if self.dir_mtimes(dirs) != dirs:
+            return False
+        
+        self.fonts = data.get('fonts', [])
+        self.dirs = dirs
+        return True
+    
+    def save_cache(self):
+        data = {
+            'version': self.VERSION,
+            'roots': self.system_dirs,
+            'dirs': self.dirs,
+            'fonts': [f for f in self.fonts if not f['local']],
+            'local': self.local_names,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp = self.cache_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+        except:
+            pass  # No cache then, just rescan next time
+    
+    def scan(self):
+        """Walk every system font directory and read each font's family/style name."""
+        self.fonts = []
+        scanned = []
+        for root_dir in self.system_dirs:
+            for d, subdirs, names in os.walk(root_dir):
+                subdirs.sort()
+                scanned.append(d)
+                for name in sorted(names):
+                    if name.lower().endswith(FONT_EXTENSIONS):
+                        self.add_font(os.path.join(d, name))
+        self.dirs = self.dir_mtimes(scanned)
+    
+    def scan_local(self):
+        """
+        List the local font directories (just the directories themselves, like
+        the old os.listdir() check). Only fonts that are new or changed since
+        they were last seen get opened. True if the cached names changed.
+        """
+        names = {}
+        for d in self.local_dirs:
+            try:
+                files = sorted(os.listdir(d))
+            except OSError:
+                continue
+            for name in files:
+                if not name.lower().endswith('.ttf'):
+                    continue
+                path = os.path.join(d, name)
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                entry = self.local_names.get(path)
+                if entry is None or entry['mtime'] != mtime:
+                    font = self.add_font(path, local=True)
+                    entry = font and {'mtime': mtime, 'family': font['family'], 'style': font['style']}
+                else:
+                    self.fonts.append({'path': path, 'family': entry['family'], 'style': entry['style'], 'local': True})
+                if entry:
+                    names[path] = entry
+        changed = names != self.local_names
+        self.local_names = names
+        return changed
+    
+    def add_font(self, path, local=False):
+        """Read a font's names and add it. Returns its entry, or None if PIL can't open it."""
+        try:
+            family, style = ImageFont.truetype(path, 12).getname()
+        except:
+            return None  # Not a font PIL can open
+        font = {'path': path, 'family': family or '', 'style': style or '', 'local': local}
+        self.fonts.append(font)
+        return font
+    
+    def build_index(self):
+        """
+        Fill the lookup tables: file names (without extension) in self.files,
+        family and family + style names in self.index. First one in wins, so
+        local fonts take priority and 'Arial' maps to the regular face rather
+        than whichever style the directory listing had first - the face whose
+        file is named after the family, else one with a regular-looking style
+        (DejaVu calls its regular face "Book").
+        """
+        self.files = {}
+        self.index = {}
+        self.resolved = {}
+        for f in sorted(self.fonts, key=lambda f: not f['local']):
+            self.files.setdefault(font_key(f['path']), f['path'])
+        
+        def priority(f):
+            return (not f['local'],
+                    font_key(f['path']) != font_key(f['family']),
+                    f['style'].lower() not in REGULAR_STYLES)
+        for f in sorted(self.fonts, key=priority):
+            keys = [font_key(f['family'])]
+            if f['style']:
+                keys.append(font_key(f['family'] + f['style']))
+            for key in keys:
+                if key:
+                    self.index.setdefault(key, f['path'])
+    
+    def find(self, name):
+        """Path for a family name, file name or path. None if nothing matches."""
+        if not name:
+            return None
+        if name in self.resolved:
+            return self.resolved[name]
+        
+        if os.path.isfile(name):
+            path = name
+        else:
+            # An exact file name beats a family that happens to share it
+            key = font_key(name)
+            path = self.files.get(key) or self.index.get(key)
+            if path is None:
+                # Not in any scanned folder - PIL has its own search paths,
+                # give those a go once and remember the answer either way
+                try:
+                    ImageFont.truetype(name, 12)
+                    path = name
+                except:
+                    pass
+        self.resolved[name] = path
+        return path
+    
+    def local_fonts(self):
+        return [f['path'] for f in self.fonts if f['local']]
+    
+    def families(self):
+        """Sorted family names, for font pickers."""
+        return sorted({f['family'] for f in self.fonts if f['family']}, key=str.lower)
+
+
+_font_registry = None
+_font_registry_lock = threading.Lock()
+
+
+def get_font_registry():
+    """The process-wide FontRegistry, created (and the cache loaded or built) on first use."""
+    global _font_registry
+    with _font_registry_lock:
+        if _font_registry is None:
+            _font_registry = FontRegistry()
+        return _font_registry
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """
+    Everything draw_frame needs that doesn't depend on time: parsed colors,
+    the loaded font, the measured text unit, intro timings and layout.
+    Built by BannerRenderer.compile_plan(). Plans with scale != 1 draw the
+    whole banner at that size (used for the preview); exports use 1.0.
+    """
+    scale: float
+    canvas_width: int
+    canvas_height: int
+    height_mode: str
+    padding: int
+    main_rgb: tuple
+    bg_c1_rgb: tuple
+    bg_c2_rgb: tuple
+    has_intro_anim: bool
+    flicker_duration: float
+    expand_dur: float
+    bg_flicker_speed: float
+    font: object
+    font_size: int
+    text_unit: str
+    unit_width: int
+    scroll_speed: float
+    text_strip: object
+    banner_height: int
+    indicator_size: int
+    target_banner_width: int
+    banner_x: int
+    banner_y: int
+    indicator_y: int
+    band_y: int
+    band_height: int
+
+    @property
+    def loop_start(self):
+        """Time at which the intro is over and the scroll/flicker loop begins."""
+        return self.flicker_duration + self.expand_dur
+
+
+class BannerRenderer:
     # Fallback font chain - tried in order until one works
     FALLBACK_FONTS = [
         "impact.ttf",
@@ -56,46 +462,44 @@ class BannerRenderer:
         "Arial"
     ]
     
+    # Pre-rendered marquee strips, shared between renderers: key -> strip.
+    # Two entries, so the preview and a full size plan don't evict each other.
+    _strip_cache = {}
+    _strip_cache_size = 2
+    _strip_lock = threading.Lock()
+    
     def __init__(self, config): 
-        self.config = config 
-        self.font_path = None
-        
-        # Check if a specific font is set in config
-        config_font = config.get('font', '')
-        if config_font:
-            # Try to use the configured font (could be family name or file path)
-            for variant in [config_font, f"{config_font}.ttf", config_font.lower().replace(' ', '') + ".ttf"]:
-                try:
-                    ImageFont.truetype(variant, 40)
-                    self.font_path = variant
+        self.config = dict(config)  # Own copy, so update_config can tell what changed
+        self._batch_template = None
+        self.font_path = self.resolve_font()
+    
+    def resolve_font(self):
+        """
+        Configured font (family name, file name or path), then local .ttf
+        files, then the fallback chain - all lookups in the font index.
+        """
+        fonts = get_font_registry()
+        font_path = fonts.find(self.config.get('font', ''))
+        if not font_path:
+            for f in fonts.local_fonts() + self.FALLBACK_FONTS:
+                font_path = fonts.find(f)
+                if font_path:
                     break
-                except:
-                    continue
-        
-        # If selected font failed or none set, try fallback chain
-        if not self.font_path:
-            # First check for local .ttf files in script directory
-            local_fonts = []
-            try:
-                for bf in os.listdir(os.getcwd()):
-                    if bf.endswith(".ttf"):
-                        local_fonts.append(bf)
-            except:
-                pass
-            
-            # Try local fonts first, then fallbacks
-            for f in local_fonts + self.FALLBACK_FONTS: 
-                try: 
-                    ImageFont.truetype(f, 40) 
-                    self.font_path = f 
-                    break 
-                except: 
-                    continue
         
         # Ultimate fallback
-        if not self.font_path:
-            self.font_path = "arial.ttf"
-        
+        return font_path or "arial.ttf"
+    
+    def update_config(self, config):
+        """
+        Switch to a new config without starting over: the font is only looked
+        up again if it changed. Returns the set of keys that changed, to hand
+        to update_plan.
+        """
+        changed = {k for k in self.config.keys() | config.keys() if self.config.get(k) != config.get(k)}
+        self.config = dict(config)
+        if 'font' in changed:
+            self.font_path = self.resolve_font()
+        return changed
 
     def get_skulls(self, level_input):
         levels = {
@@ -120,42 +524,222 @@ class BannerRenderer:
             
         return " " + " ".join(["\u2126"] * count) + " "
 
-    def draw_frame(self, time_sec, width, height_mode, height_val, padding):
-        BANNER_HEIGHT = 80
-        INDICATOR_SIZE = 60
-        FONT_SIZE = 40
+    def hex_to_rgb(self, hex_color):
+        return tuple(int(hex_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+
+    def get_text_unit(self):
+        """Build one repeat of the marquee text (message + skull suffix)."""
+        base_msg = "POLICE ASSAULT IN PROGRESS" 
+        if self.config.get('custom_text'):
+            base_msg = self.config.get('custom_text').upper()
         
+        threat = self.config.get('threat_level', 'Normal (1 skull)')
+        suffix = " /// " + self.get_skulls(threat) + " /// "
+        return base_msg + suffix
+
+    def load_font(self, size=FONT_SIZE):
+        try:
+            return ImageFont.truetype(self.font_path, size)
+        except:
+            return ImageFont.load_default()
+
+    def measure_text(self, text, font):
+        dummy = ImageDraw.Draw(Image.new('L', (1,1)))
+        bbox = dummy.textbbox((0,0), text, font=font)
+        return bbox[2] - bbox[0]
+
+    def get_text_strip(self, text_unit, font, unit_width, min_width,
+                       font_size=FONT_SIZE, banner_height=BANNER_HEIGHT):
+        """
+        Return an 'L' mask with the text unit rasterized back to back every
+        unit_width px, at least min_width + unit_width wide. Cropping it at
+        scroll_offset % unit_width gives the marquee for any scroll position,
+        so the text only ever gets rasterized once per config.
+        """
+        key = (text_unit, self.font_path, font_size, banner_height, unit_width)
+        strip_width = max(1, min_width) + unit_width
+        
+        with BannerRenderer._strip_lock:
+            cache = BannerRenderer._strip_cache
+            strip = cache.pop(key, None)
+            if strip is None or strip.width < strip_width:
+                strip = Image.new('L', (strip_width, banner_height), 0)
+                s_draw = ImageDraw.Draw(strip)
+                text_y = (banner_height - font_size) // 2 - scale_px(5, font_size / FONT_SIZE)
+                draw_x = 0
+                while draw_x < strip_width:
+                    s_draw.text((draw_x, text_y), text_unit, font=font, fill=255)
+                    draw_x += unit_width
+            
+            # Most recently used last
+            cache[key] = strip
+            while len(cache) > BannerRenderer._strip_cache_size:
+                del cache[next(iter(cache))]
+            return strip
+
+    def plan_layout(self, width, height_mode, padding, scale=1.0):
+        """Canvas size and banner position, the RenderPlan fields that depend on LAYOUT_KEYS."""
         if height_mode == "fixed":
             canvas_height = 1080
-            canvas_width = width
-            center_y = canvas_height // 2
         else:
             canvas_height = BANNER_HEIGHT + (padding * 2)
-            canvas_width = width
-            center_y = canvas_height // 2
+        # Lay out at full size, then scale every measurement
+        canvas_width = scale_px(width, scale)
+        canvas_height = scale_px(canvas_height, scale)
+        banner_height = scale_px(BANNER_HEIGHT, scale)
+        indicator_size = scale_px(INDICATOR_SIZE, scale)
+        center_y = canvas_height // 2
+        
+        target_banner_width = scale_px(width - 100, scale)
+        banner_x = (canvas_width - target_banner_width - indicator_size) // 2
+        banner_y = center_y - (banner_height // 2)
+        indicator_y = center_y - (indicator_size // 2)
+        
+        # The only rows that are ever drawn on (the indicator square is size + 1 px)
+        band_y = max(0, min(banner_y, indicator_y))
+        band_end = min(canvas_height, max(banner_y + banner_height, indicator_y + indicator_size + 1))
+        
+        return dict(
+            canvas_width=canvas_width,
+            canvas_height=canvas_height,
+            height_mode=height_mode,
+            padding=padding,
+            banner_height=banner_height,
+            indicator_size=indicator_size,
+            target_banner_width=target_banner_width,
+            banner_x=banner_x,
+            banner_y=banner_y,
+            indicator_y=indicator_y,
+            band_y=band_y,
+            band_height=max(1, band_end - band_y),
+        )
+    
+    def plan_text(self, scale=1.0):
+        """Font and measured text unit, the RenderPlan fields that depend on TEXT_KEYS."""
+        font_size = scale_px(FONT_SIZE, scale)
+        font = self.load_font(font_size)
+        text_unit = self.get_text_unit()
+        unit_width = self.measure_text(text_unit, font)
+        if unit_width < 1: unit_width = 100
+        
+        scroll_speed = SCROLL_SPEED
+        if scale != 1:
+            # Text doesn't shrink exactly in proportion - scroll one unit in
+            # the same time as the full size banner so the loop still lines up
+            full_width = self.measure_text(text_unit, self.load_font())
+            if full_width >= 1:
+                scroll_speed = SCROLL_SPEED * unit_width / full_width
+        return dict(font=font, font_size=font_size, text_unit=text_unit,
+                    unit_width=unit_width, scroll_speed=scroll_speed)
+    
+    def plan_colours(self):
+        """Banner colours, the RenderPlan fields that depend on COLOUR_KEYS."""
+        return dict(
+            main_rgb=self.hex_to_rgb(self.config.get('color', '#FFEF00')),
+            bg_c1_rgb=self.hex_to_rgb(self.config.get('bg_color_1', '#FFEF00')),
+            bg_c2_rgb=self.hex_to_rgb(self.config.get('bg_color_2', '#BDB200')),
+        )
+    
+    def plan_timing(self):
+        """Intro and flicker timings, the RenderPlan fields that depend on TIMING_KEYS."""
+        has_intro_anim = bool(self.config.get('start_flicker', False))
+        return dict(
+            has_intro_anim=has_intro_anim,
+            flicker_duration=self.config.get('start_flicker_duration', 2.0) if has_intro_anim else 0.0,
+            expand_dur=EXPAND_DURATION if has_intro_anim else 0.0,  # Skip expansion when flicker is disabled
+            bg_flicker_speed=flicker_rate(self.config.get('bg_flicker_speed', 1.0)),
+        )
 
-        # Main Canvas (Transparent)
-        img = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0)) 
-        draw = ImageDraw.Draw(img)
+    def compile_plan(self, width, height_mode, padding, scale=1.0):
+        """
+        Resolve the config into a RenderPlan for the given canvas settings.
+        Everything that doesn't change from frame to frame is worked out here
+        once, so draw_frame only has to do the time-dependent drawing.
+        With scale < 1 the frame is laid out and drawn directly at that size
+        (the preview), rather than drawn full size and shrunk afterwards.
+        """
+        fields = self.plan_layout(width, height_mode, padding, scale)
+        fields.update(self.plan_text(scale))
+        fields.update(self.plan_colours())
+        fields.update(self.plan_timing())
+        fields['scale'] = scale
+        fields['text_strip'] = self.get_text_strip(
+            fields['text_unit'], fields['font'], fields['unit_width'], fields['target_banner_width'],
+            fields['font_size'], fields['banner_height'])
+        return RenderPlan(**fields)
+    
+    def update_plan(self, plan, changed):
+        """
+        Recompile only the parts of plan that the changed config keys (from
+        update_config) affect: a colour change doesn't touch the font or text
+        strip, a text change doesn't touch the layout, and so on. Returns the
+        same plan if nothing it depends on changed.
+        """
+        fields = {}
+        if changed & LAYOUT_KEYS:
+            fields.update(self.plan_layout(
+                self.config.get('canvas_width', plan.canvas_width),
+                self.config.get('canvas_height_mode', plan.height_mode),
+                self.config.get('fit_padding', plan.padding), plan.scale))
+        if changed & TEXT_KEYS:
+            fields.update(self.plan_text(plan.scale))
+        if changed & COLOUR_KEYS:
+            fields.update(self.plan_colours())
+        if changed & TIMING_KEYS:
+            fields.update(self.plan_timing())
+        if not fields:
+            return plan
+        
+        if changed & (TEXT_KEYS | LAYOUT_KEYS):
+            # Cached strip is reused unless the text changed or the banner got wider
+            fields['text_strip'] = self.get_text_strip(
+                fields.get('text_unit', plan.text_unit), fields.get('font', plan.font),
+                fields.get('unit_width', plan.unit_width),
+                fields.get('target_banner_width', plan.target_banner_width),
+                fields.get('font_size', plan.font_size),
+                fields.get('banner_height', plan.banner_height))
+        return replace(plan, **fields)
+
+    def draw_corners(self, draw, w, h, c_fill, scale=1.0):
+        corner_len = scale_px(20, scale)
+        corner_thick = scale_px(3, scale)
         
-        # Parse Colors
-        main_color_hex = self.config.get('color', '#FFEF00')
-        bg_color_1_hex = self.config.get('bg_color_1', '#FFEF00') 
-        bg_color_2_hex = self.config.get('bg_color_2', '#BDB200')
+        # Top-Left
+        draw.rectangle([0, 0, corner_len, corner_thick], fill=c_fill)
+        draw.rectangle([0, 0, corner_thick, corner_len], fill=c_fill)
         
-        main_color_rgb = tuple(int(main_color_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
-        bg_c1_rgb = tuple(int(bg_color_1_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
-        bg_c2_rgb = tuple(int(bg_color_2_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+        # Top-Right
+        draw.rectangle([w - corner_len, 0, w, corner_thick], fill=c_fill)
+        draw.rectangle([w - corner_thick, 0, w, corner_len], fill=c_fill)
+        
+        # Bot-Left
+        draw.rectangle([0, h - corner_thick, corner_len, h], fill=c_fill)
+        draw.rectangle([0, h - corner_len, corner_thick, h], fill=c_fill)
+        
+        # Bot-Right
+        draw.rectangle([w - corner_len, h - corner_thick, w, h], fill=c_fill)
+        draw.rectangle([w - corner_thick, h - corner_len, w, h], fill=c_fill)
+
+    def mix_colour(self, c1, c2, mix_factor):
+        r = snap_int(c1[0] + (c2[0] - c1[0]) * mix_factor)
+        g = snap_int(c1[1] + (c2[1] - c1[1]) * mix_factor)
+        b = snap_int(c1[2] + (c2[2] - c1[2]) * mix_factor)
+        return (r, g, b)
+
+    def frame_state(self, time_sec, plan):
+        """
+        Work out the time-dependent part of a frame:
+        (indicator_opacity, banner_width, bg_rgb, scroll_offset).
+        """
+        p = plan
         
         # --- Animation Variables ---
-        has_intro_anim = self.config.get('start_flicker', False)
-        flicker_duration = self.config.get('start_flicker_duration', 2.0) if has_intro_anim else 0.0
-        start_time = flicker_duration
-        expand_dur = 0.45 if has_intro_anim else 0.0  # Skip expansion when flicker is disabled
+        start_time = p.flicker_duration
+        loop_start = p.loop_start
         
         # Indicator Flicker
         indicator_opacity = 255
-        if has_intro_anim and time_sec < flicker_duration:
+        if p.has_intro_anim and time_sec < start_time:
             phase = (time_sec % 0.5) / 0.5
             if phase > 0.5:
                 indicator_opacity = 0
@@ -163,25 +747,26 @@ class BannerRenderer:
                 indicator_opacity = 255
 
         # Banner Width Calculation
-        target_banner_width = canvas_width - 100 
+        target_banner_width = p.target_banner_width
         current_banner_width = 0
         
-        if not has_intro_anim:
+        if not p.has_intro_anim:
             # No intro animation - show full banner immediately
             current_banner_width = target_banner_width
         elif time_sec < start_time:
             current_banner_width = 0
-        elif time_sec < start_time + expand_dur:
-            progress = (time_sec - start_time) / expand_dur
+        elif time_sec < loop_start:
+            progress = (time_sec - start_time) / p.expand_dur
             current_banner_width = int(target_banner_width * progress)
         else:
             current_banner_width = target_banner_width
 
         # Background Flicker Interpolation
+        bg_c1_rgb, bg_c2_rgb = p.bg_c1_rgb, p.bg_c2_rgb
         current_bg_rgb = bg_c1_rgb
-        if time_sec > start_time + expand_dur:
-            loop_time = time_sec - (start_time + expand_dur)
-            speed_mult = self.config.get('bg_flicker_speed', 1.0)
+        if time_sec > loop_start:
+            loop_time = time_sec - loop_start
+            speed_mult = p.bg_flicker_speed
             mix_factor = 0.0
             
             if speed_mult > 0:
@@ -192,1028 +777,1226 @@ class BannerRenderer:
                 else:
                     mix_factor = 1.0 - ((cycle - 0.5) / 0.5)
             
-            r = int(bg_c1_rgb[0] + (bg_c2_rgb[0] - bg_c1_rgb[0]) * mix_factor)
-            g = int(bg_c1_rgb[1] + (bg_c2_rgb[1] - bg_c1_rgb[1]) * mix_factor)
-            b = int(bg_c1_rgb[2] + (bg_c2_rgb[2] - bg_c1_rgb[2]) * mix_factor)
-            current_bg_rgb = (r, g, b)
+            current_bg_rgb = self.mix_colour(bg_c1_rgb, bg_c2_rgb, mix_factor)
+        
+        # Calculate Scrolling
+        curr_scroll_time = 0
+        if time_sec > loop_start:
+            curr_scroll_time = time_sec - loop_start
+        scroll_offset = snap_int(curr_scroll_time * p.scroll_speed)
+        
+        return indicator_opacity, current_banner_width, current_bg_rgb, scroll_offset
+
+    def draw_frame(self, time_sec, plan, band=False):
+        """
+        Draw the frame at time_sec as an RGBA image. With band=True only the
+        plan.band_height rows starting at plan.band_y are drawn (everything
+        else is always transparent) - in fixed 1080p mode that's a small
+        fraction of the canvas.
+        """
+        p = plan
+        indicator_opacity, current_banner_width, current_bg_rgb, scroll_offset = self.frame_state(time_sec, p)
         
-        # Layout Coordinates
-        offset_x = (canvas_width - target_banner_width - INDICATOR_SIZE) // 2
-        banner_x = offset_x
-        banner_y = center_y - (BANNER_HEIGHT // 2)
+        # Main Canvas (Transparent)
+        img = Image.new('RGBA', (p.canvas_width, p.band_height), (0, 0, 0, 0)) 
+        draw = ImageDraw.Draw(img)
         
-        indicator_x = banner_x + current_banner_width + 10 
-        indicator_y = center_y - (INDICATOR_SIZE // 2)
+        indicator_x = p.banner_x + current_banner_width + scale_px(10, p.scale)
+        indicator_y = p.indicator_y - p.band_y
+        bh = p.banner_height
+        size = p.indicator_size
         
         # Draw Banner
         if current_banner_width > 0:
             banner_bg_color = (*current_bg_rgb, 180)
-            banner_surf = Image.new('RGBA', (current_banner_width, BANNER_HEIGHT), banner_bg_color)
+            banner_surf = Image.new('RGBA', (current_banner_width, bh), banner_bg_color)
             b_draw = ImageDraw.Draw(banner_surf)
             
-            # Draw Marquee Text on Banner Surface
-            base_msg = "POLICE ASSAULT IN PROGRESS" 
-            if self.config.get('custom_text'):
-                base_msg = self.config.get('custom_text').upper()
-            
-            threat = self.config.get('threat_level', 'Normal (1 skull)')
-            suffix = " /// " + self.get_skulls(threat) + " /// "
-            full_text_unit = base_msg + suffix
-            
-            try:
-                font = ImageFont.truetype(self.font_path, FONT_SIZE)
-            except:
-                font = ImageFont.load_default()
-            
-            # Calculate Scrolling
-            scroll_speed = 200
-            curr_scroll_time = 0
-            if time_sec > start_time + expand_dur:
-                curr_scroll_time = time_sec - (start_time + expand_dur)
-            
-            scroll_offset = int(curr_scroll_time * scroll_speed)
-            
-            text_bbox = b_draw.textbbox((0,0), full_text_unit, font=font)
-            unit_width = text_bbox[2] - text_bbox[0]
-            if unit_width < 1: unit_width = 100
-            
-            start_draw_x = -(scroll_offset % unit_width)
-            text_y = (BANNER_HEIGHT - FONT_SIZE) // 2 - 5
-            text_fill = (*main_color_rgb, 255)
-            
-            draw_x = start_draw_x
-            while draw_x < current_banner_width:
-                b_draw.text((draw_x, text_y), full_text_unit, font=font, fill=text_fill)
-                draw_x += unit_width
+            # Draw Marquee Text - slice of the pre-rendered strip
+            strip_x = scroll_offset % p.unit_width
+            text_mask = p.text_strip.crop((strip_x, 0, strip_x + current_banner_width, bh))
+            banner_surf.paste((*p.main_rgb, 255), (0, 0, current_banner_width, bh), text_mask)
 
             # Draw Corner Accents on Banner Surface
-            corner_len = 20
-            corner_thick = 3
-            c_fill = (*main_color_rgb, 255)
-            
-            w = current_banner_width
-            h = BANNER_HEIGHT
-            
-            # Top-Left
-            b_draw.rectangle([0, 0, corner_len, corner_thick], fill=c_fill)
-            b_draw.rectangle([0, 0, corner_thick, corner_len], fill=c_fill)
-            
-            # Top-Right
-            b_draw.rectangle([w - corner_len, 0, w, corner_thick], fill=c_fill)
-            b_draw.rectangle([w - corner_thick, 0, w, corner_len], fill=c_fill)
-            
-            # Bot-Left
-            b_draw.rectangle([0, h - corner_thick, corner_len, h], fill=c_fill)
-            b_draw.rectangle([0, h - corner_len, corner_thick, h], fill=c_fill)
-            
-            # Bot-Right
-            b_draw.rectangle([w - corner_len, h - corner_thick, w, h], fill=c_fill)
-            b_draw.rectangle([w - corner_thick, h - corner_len, w, h], fill=c_fill)
+            self.draw_corners(b_draw, current_banner_width, bh, (*p.main_rgb, 255), p.scale)
 
             # Paste Banner onto Main Image
-            img.paste(banner_surf, (banner_x, banner_y))
+            img.paste(banner_surf, (p.banner_x, p.banner_y - p.band_y))
 
         # Draw Indicator
         if indicator_opacity > 0:
-            ind_color = (*main_color_rgb, indicator_opacity)
-            draw.rectangle([indicator_x, indicator_y, indicator_x + INDICATOR_SIZE, indicator_y + INDICATOR_SIZE], fill=ind_color)
+            ind_color = (*p.main_rgb, indicator_opacity)
+            draw.rectangle([indicator_x, indicator_y, indicator_x + size, indicator_y + size], fill=ind_color)
             
             ix, iy = indicator_x, indicator_y
-            pad = 12
-            p1 = (ix + INDICATOR_SIZE//2, iy + pad) 
-            p2 = (ix + INDICATOR_SIZE - pad, iy + INDICATOR_SIZE - pad) 
-            p3 = (ix + pad, iy + INDICATOR_SIZE - pad) 
+            pad = scale_px(12, p.scale)
+            p1 = (ix + size//2, iy + pad) 
+            p2 = (ix + size - pad, iy + size - pad) 
+            p3 = (ix + pad, iy + size - pad) 
             
             points = [p1, p2, p3, p1]
-            draw.line(points, fill=(0,0,0, indicator_opacity), width=7, joint="curve")
+            draw.line(points, fill=(0,0,0, indicator_opacity), width=scale_px(7, p.scale), joint="curve")
 
-        return img
+        if band or p.band_height == p.canvas_height:
+            return img
+        full = Image.new('RGBA', (p.canvas_width, p.canvas_height), (0, 0, 0, 0))
+        full.paste(img, (0, p.band_y))
+        return full
 
-    def estimate_loop_duration(self):
+    def get_batch_template(self, plan):
         """
-        Calculate the optimal GIF loop duration that ensures both the text scroll
-        and background flicker animations complete full cycles for seamless looping.
+        Static pieces of a steady-state frame for draw_frames_array, cached
+        for the last plan: (band canvas, corner mask, text strip array).
         """
-        base_msg = "POLICE ASSAULT IN PROGRESS" 
-        if self.config.get('custom_text'):
-            base_msg = self.config.get('custom_text').upper()
-        
-        threat = self.config.get('threat_level', 'Normal (1 skull)')
-        suffix = " /// " + self.get_skulls(threat) + " /// "
-        full_text_unit = base_msg + suffix
+        import numpy as np
+        cached = self._batch_template
+        if cached and cached[0] is plan:
+            return cached[1]
+        
+        # After the intro everything outside the banner is static, and inside
+        # it only the background colour and the text position change
+        canvas = np.asarray(self.draw_frame(plan.loop_start + 1.0, plan, band=True))
+        
+        corners = Image.new('L', (plan.target_banner_width, plan.banner_height), 0)
+        self.draw_corners(ImageDraw.Draw(corners), plan.target_banner_width, plan.banner_height, 255, plan.scale)
+        corner_mask = np.asarray(corners) > 0
+        
+        template = (canvas, corner_mask, np.asarray(plan.text_strip))
+        self._batch_template = (plan, template)
+        return template
+
+    def text_lut(self, plan, bg_rgb):
+        """
+        (256, 4) table of what a banner pixel becomes for each text mask value,
+        on top of the given background. Built by PIL itself so it matches the
+        per-frame paste exactly.
+        """
+        import numpy as np
+        lut = Image.new('RGBA', (256, 1), (*bg_rgb, 180))
+        lut.paste((*plan.main_rgb, 255), None, MASK_RAMP)
+        return np.asarray(lut)[0]
+
+    def draw_frames_array(self, frame_times, plan, band=False, out=None):
+        """
+        Vectorized counterpart of draw_frame: render every time in frame_times
+        into one (N, H, W, 4) uint8 array (H = plan.band_height with band=True),
+        or into out if given.
+        Steady-state frames are assembled with numpy (static canvas + shifted
+        text strip through a colour LUT); intro frames fall back to draw_frame.
+        """
+        import numpy as np
+        p = plan
+        canvas, corner_mask, strip = self.get_batch_template(p)
+        states = [self.frame_state(t, p) for t in frame_times]
+        
+        frames = out if out is not None else np.empty((len(states), p.band_height, p.canvas_width, 4), np.uint8)
+        frames[:] = canvas
+        
+        steady = []
+        for i, (opacity, banner_width, _, _) in enumerate(states):
+            if opacity == 255 and banner_width == p.target_banner_width:
+                steady.append(i)
+            else:
+                frames[i] = np.asarray(self.draw_frame(frame_times[i], p, band=True))
         
-        try:
-            font = ImageFont.truetype(self.font_path, 40)
-        except:
-            font = ImageFont.load_default()
+        if steady:
+            w = p.target_banner_width
+            corner_px = np.array([(*p.main_rgb, 255)], np.uint8).view(np.uint32)[0]
             
-        dummy = ImageDraw.Draw(Image.new('L', (1,1)))
-        bbox = dummy.textbbox((0,0), full_text_unit, font=font)
-        unit_width = bbox[2] - bbox[0]
-        
-        scroll_speed = 200 
-        text_cycle = unit_width / scroll_speed  # Duration for one full text scroll
-        
-        # Calculate background flicker cycle duration
-        bg_speed = self.config.get('bg_flicker_speed', 1.0)
-        if bg_speed > 0:
-            # One flicker cycle is 1.0 / bg_speed seconds (triangle wave goes 0->1->0)
-            flicker_cycle = 1.0 / bg_speed
+            # Work on whole RGBA pixels as uint32 so the LUT lookup is a single take()
+            frames32 = frames.view(np.uint32)[..., 0]
+            luts = {}
+            for i in steady:
+                _, _, bg_rgb, scroll_offset = states[i]
+                if bg_rgb not in luts:
+                    luts[bg_rgb] = self.text_lut(p, bg_rgb).view(np.uint32)[:, 0]
+                
+                offset = scroll_offset % p.unit_width
+                banner_y = p.banner_y - p.band_y
+                banner = frames32[i, banner_y:banner_y + p.banner_height, p.banner_x:p.banner_x + w]
+                np.take(luts[bg_rgb], strip[:, offset:offset + w], out=banner)
+                np.copyto(banner, corner_px, where=corner_mask)
+        
+        if band or p.band_height == p.canvas_height:
+            return frames
+        full = np.zeros((len(states), p.canvas_height, p.canvas_width, 4), np.uint8)
+        full[:, p.band_y:p.band_y + p.band_height] = frames
+        return full
+
+    def build_gif_palette(self, plan, max_colours=255):
+        """
+        Fixed palette covering every colour a frame of this plan can contain:
+        transparent (index 0), main colour, black, and for a spread of the
+        background flicker steps, a few text anti-aliasing levels on top of
+        that background. Returns a list of RGB tuples.
+        """
+        # Every background step the triangle wave can produce
+        bg_steps = []
+        for i in range(1025):
+            colour = self.mix_colour(plan.bg_c1_rgb, plan.bg_c2_rgb, i / 1024)
+            if colour not in bg_steps:
+                bg_steps.append(colour)
+        
+        # Split the room between background steps and anti-aliasing levels
+        room = max_colours - 3
+        aa_levels = min(max(room // len(bg_steps), 4), 16)
+        bg_count = min(len(bg_steps), room // aa_levels)
+        picks = [bg_steps[round(k * (len(bg_steps) - 1) / max(bg_count - 1, 1))] for k in range(bg_count)]
+        
+        palette = [(0, 0, 0), plan.main_rgb, (0, 0, 0)]
+        for bg_rgb in picks:
+            lut = self.text_lut(plan, bg_rgb)
+            for j in range(aa_levels):
+                colour = tuple(int(c) for c in lut[round(j * 255 / aa_levels)][:3])
+                if colour not in palette[1:]:
+                    palette.append(colour)
+        return palette[:max_colours]
+
+    def render(self, frame_times, plan, band=False):
+        """
+        Render frames as RGBA images using the engine chosen in
+        config['render_engine']. band=True gives just the plan's band rows
+        (see draw_frame).
+        """
+        if self.config.get('render_engine', 'pil') == 'numpy':
+            return [Image.fromarray(f, 'RGBA') for f in self.draw_frames_array(frame_times, plan, band)]
+        return [self.draw_frame(t, plan, band) for t in frame_times]
+    
+    def render_arrays(self, frame_times, plan, band=False, out=None):
+        """
+        Like render(), but frames come back as (H, W, 4) uint8 arrays. With
+        out (an (N, H, W, 4) array) they're drawn into it and out is returned.
+        """
+        import numpy as np
+        if self.config.get('render_engine', 'pil') == 'numpy':
+            return self.draw_frames_array(frame_times, plan, band, out)
+        if out is None:
+            return [np.asarray(self.draw_frame(t, plan, band)) for t in frame_times]
+        for frame, t in zip(out, frame_times):
+            frame[:] = np.asarray(self.draw_frame(t, plan, band))
+        return out
+
+class FrameRing:
+    """
+    Preallocated frame slots in shared memory (multiprocessing.shared_memory)
+    for getting frames out of export workers without pickling them. Slots
+    are handed out a batch (RENDER_BATCH_SIZE) at a time in ring order: the
+    worker draws the batch straight into its slots and sends back only the
+    slot number, and the parent reads the frames as numpy views, so the cost
+    per frame doesn't grow with the resolution.
+    
+    in_flight is how many batches may be rendering or waiting to be read at
+    once, hold how many of the most recently read frames the reader may
+    still be using; a batch's slots only come round again once both have
+    moved past them.
+    """
+    def __init__(self, frame_shape, in_flight, hold):
+        import numpy as np
+        from multiprocessing import shared_memory
+        self.frame_shape = tuple(frame_shape)
+        self.in_flight = in_flight
+        self.batches = in_flight + -(-hold // RENDER_BATCH_SIZE)
+        self.slots = self.batches * RENDER_BATCH_SIZE
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slots * math.prod(self.frame_shape))
+        self.frames = np.ndarray((self.slots,) + self.frame_shape, np.uint8, buffer=self.shm.buf)
+    
+    @classmethod
+    def for_plan(cls, plan, in_flight, hold):
+        """A ring for export frames of plan (its band rows at canvas width)."""
+        return cls((plan.band_height, plan.canvas_width, 4), in_flight, hold)
+    
+    @staticmethod
+    def attach(name, frame_shape, slots):
+        """Open a ring made in another process: (shared memory, (slots, *frame_shape) array)."""
+        import numpy as np
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray((slots,) + tuple(frame_shape), np.uint8, buffer=shm.buf)
+    
+    def spec(self):
+        """What a worker needs to attach() to this ring."""
+        return self.shm.name, self.frame_shape, self.slots
+    
+    def batch_slot(self, batch):
+        """First slot for the batch-th batch."""
+        return batch % self.batches * RENDER_BATCH_SIZE
+    
+    def read(self, slot, count, fmt):
+        """count frames from slot on, as views: ndarrays for mp4, images for gif."""
+        frames = self.frames[slot:slot + count]
+        if fmt == 'mp4':
+            return list(frames)
+        height, width = self.frame_shape[:2]
+        return [Image.frombuffer('RGBA', (width, height), f, 'raw', 'RGBA', 0, 1) for f in frames]
+    
+    def close(self):
+        """Free the shared memory. Frames read from the ring must not be touched after this."""
+        if self.frames is None:
+            return
+        self.frames = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class FrameStore:
+    """
+    Frames by index, for work that has to go back to frames it has already
+    seen (the loop replay in render_export_frames). Frames up to
+    memory_budget bytes stay in RAM; the rest of the capacity spills into a
+    numpy.memmap over a temp file, so a store can be far bigger than memory.
+    
+    Frames are uint8 arrays of frame_shape, or RGBA images of that size with
+    images=True. close() (or leaving a with block) drops the spill file: it
+    is an anonymous tempfile.TemporaryFile, so the OS deletes it once the
+    last frame read from it is gone - also when an export is cancelled or
+    the process dies.
+    """
+    def __init__(self, frame_shape, capacity, memory_budget=LOOP_CACHE_BUDGET, images=False):
+        self.frame_shape = tuple(frame_shape)
+        self.capacity = capacity
+        self.images = images
+        frame_bytes = math.prod(self.frame_shape)
+        self.memory_frames = min(capacity, memory_budget // frame_bytes)
+        self.memory = []
+        self.spill = None
+        self.spill_file = None
+        self.spilled = 0
+    
+    def __len__(self):
+        return len(self.memory) + self.spilled
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def open_spill(self):
+        import numpy as np
+        count = self.capacity - self.memory_frames
+        self.spill_file = tempfile.TemporaryFile(prefix='payday_frames_')
+        self.spill_file.truncate(count * math.prod(self.frame_shape))
+        self.spill = np.memmap(self.spill_file, np.uint8, mode='r+', shape=(count,) + self.frame_shape)
+    
+    def append(self, frame, copy=False):
+        """Add a frame at index len(self). copy=True if the caller will reuse the frame's memory."""
+        if len(self.memory) < self.memory_frames:
+            self.memory.append(frame.copy() if copy else frame)
+            return
+        if len(self) >= self.capacity:
+            raise IndexError("frame store is full")
+        if self.spill is None:
+            self.open_spill()
+        self.spill[self.spilled] = frame
+        self.spilled += 1
+    
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("frame index out of range")
+        if i < len(self.memory):
+            return self.memory[i]
+        frame = self.spill[i - len(self.memory)]
+        if self.images:
+            height, width = self.frame_shape[:2]
+            return Image.frombuffer('RGBA', (width, height), frame, 'raw', 'RGBA', 0, 1)
+        return frame
+    
+    def close(self):
+        self.memory = []
+        self.spill = None
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+
+# Per-process state for parallel export workers (set by _init_render_worker)
+_worker_renderer = None
+_worker_plan = None
+_worker_ring = None
+
+
+def _init_render_worker(config, width, height_mode, padding, scroll_speed, ring=None):
+    global _worker_renderer, _worker_plan, _worker_ring
+    _worker_renderer = BannerRenderer(config)
+    plan = _worker_renderer.compile_plan(width, height_mode, padding)
+    # The scroll speed may have been nudged for the loop (see solve_loop)
+    _worker_plan = replace(plan, scroll_speed=scroll_speed)
+    if ring is not None:
+        _worker_ring = FrameRing.attach(*ring)
+
+
+def _render_export_batch(renderer, plan, frame_times, fmt):
+    # Exports only render the plan's band; the writers place it on the canvas
+    if fmt == 'mp4':
+        return list(renderer.render_arrays(frame_times, plan, band=True))
+    return renderer.render(frame_times, plan, band=True)
+
+
+def _render_worker_batch(frame_times, fmt):
+    return _render_export_batch(_worker_renderer, _worker_plan, frame_times, fmt)
+
+
+def _render_worker_slots(frame_times, slot):
+    _, frames = _worker_ring
+    out = frames[slot:slot + len(frame_times)]
+    _worker_renderer.render_arrays(frame_times, _worker_plan, band=True, out=out)
+    return slot, len(frame_times)
+
+
+def _batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def render_frames(renderer, plan, frame_times, fmt, workers=1, max_pending=None, ring=None):
+    """
+    Yield export-ready frames (RGBA ndarrays for mp4, RGBA images for gif)
+    for each time in frame_times, in order. Frames only cover the plan's
+    band rows (plan.band_y onwards), for the writers' offset_y.
+    
+    Frames are rendered RENDER_BATCH_SIZE at a time with the renderer's
+    configured engine. With workers > 1 the batches are drawn in a process
+    pool; at most max_pending batches (default 2 per worker) are in flight
+    or waiting to be reordered at any time, which keeps memory bounded on
+    long exports.
+    
+    With a FrameRing the workers draw into its slots instead of pickling
+    frames back, and the frames yielded are views of those slots: they're
+    overwritten once the reader is ring.hold frames further on, so copy any
+    that are kept longer. ring.in_flight replaces max_pending.
+    """
+    batches = _batched(frame_times, RENDER_BATCH_SIZE)
+    if workers <= 1:
+        for batch in batches:
+            yield from _render_export_batch(renderer, plan, batch, fmt)
+        return
+    
+    max_pending = max(max_pending or workers * 2, workers)
+    if ring is not None:
+        max_pending = ring.in_flight
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(dict(renderer.config), plan.canvas_width, plan.height_mode, plan.padding,
+                  plan.scroll_speed, ring.spec() if ring is not None else None))
+    
+    def results(future):
+        if ring is None:
+            return future.result()
+        return ring.read(*future.result(), fmt)
+    
+    pending = deque()
+    try:
+        for n, batch in enumerate(batches):
+            if len(pending) >= max_pending:
+                yield from results(pending.popleft())
+            if ring is None:
+                pending.append(pool.submit(_render_worker_batch, batch, fmt))
+            else:
+                pending.append(pool.submit(_render_worker_slots, batch, ring.batch_slot(n)))
+        while pending:
+            yield from results(pending.popleft())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def loop_periods(plan, fps):
+    """
+    Periods of the steady-state animation in frames at fps, as exact
+    fractions: the text scroll, then the background flicker (if any).
+    fps can be a Fraction too.
+    """
+    fps = Fraction(fps)
+    periods = [plan.unit_width * fps / Fraction(plan.scroll_speed)]
+    if plan.bg_flicker_speed > 0:
+        periods.append(fps / Fraction(plan.bg_flicker_speed))
+    return periods
+
+
+def find_loop_period_frames(plan, fps):
+    """
+    Smallest whole number of frames at the given fps after which the
+    steady-state animation (scroll + background flicker) repeats exactly.
+    Awkward text widths and flicker speeds can make this huge; see
+    solve_loop for a short one.
+    """
+    # N frames is a multiple of a/b (reduced) exactly when a divides N
+    period = 1
+    for p in loop_periods(plan, fps):
+        period = math.lcm(period, p.numerator)
+    return period
+
+
+def solve_loop(plan, clock, max_nudge=0.0):
+    """
+    Find a seamless loop in whole frames of clock (see FrameClock). Returns
+    (frames, plan): the steady-state animation of the returned plan repeats
+    exactly every frames frames, and so does the clock's frame spacing.
+    
+    Without max_nudge this is find_loop_period_frames and the plan is
+    unchanged. Otherwise the scroll speed may change by up to that fraction
+    (0.02 = 2%), and the shortest loop that allows wins; the plan returned
+    carries the nudged speed as an exact Fraction.
+    """
+    exact = math.lcm(find_loop_period_frames(plan, clock.fps), clock.cycle)
+    if max_nudge <= 0:
+        return exact, plan
+    
+    fps = Fraction(clock.fps)
+    speed = Fraction(plan.scroll_speed)
+    periods = loop_periods(plan, fps)
+    # The flicker isn't touched, so the loop is a whole number of its periods...
+    step = periods[1].numerator if len(periods) > 1 else 1
+    step = math.lcm(step, clock.cycle)
+    for frames in range(step, exact, step):
+        # ...and the scroll speed is whatever moves a whole number of text units in it
+        units = round(frames * speed / (fps * plan.unit_width))
+        nudged = units * plan.unit_width * fps / frames
+        if units >= 1 and abs(nudged - speed) <= speed * max_nudge:
+            return frames, replace(plan, scroll_speed=nudged)
+    return exact, plan
+
+
+class FrameClock:
+    """
+    When each frame of an export is shown: frame i at i / fps seconds.
+    cycle is after how many frames the spacing between frames repeats;
+    loops have to be a multiple of it.
+    """
+    cycle = 1
+    
+    def __init__(self, fps):
+        self.fps = fps
+    
+    def time(self, i):
+        return i / self.fps
+    
+    def frame_count(self, seconds):
+        """Frames in an export of this many seconds."""
+        return int(seconds * self.fps)
+
+
+class GifClock(FrameClock):
+    """
+    GIF delays are whole centiseconds, and viewers slow anything under
+    2 cs right down, so GIF frames run at no more than GIF_MAX_FPS and sit
+    on the centisecond grid: frame i is shown at floor(i * 100 / fps) cs.
+    Delays then vary (30 fps is 3, 3, 4 cs...) but the long-run rate is
+    exact, and each frame is rendered at the time it's actually shown.
+    """
+    def __init__(self, fps):
+        super().__init__(min(fps, GIF_MAX_FPS))
+        self.cycle = self.fps // math.gcd(self.fps, 100)
+    
+    def centis(self, i):
+        return i * 100 // self.fps
+    
+    def time(self, i):
+        return self.centis(i) / 100
+    
+    def delay_ms(self, i):
+        """How long frame i stays up, in ms (always whole centiseconds)."""
+        return (self.centis(i + 1) - self.centis(i)) * 10
+
+
+def export_clock(fmt, fps):
+    """The FrameClock for an export at fps in fmt ('mp4' or 'gif')."""
+    return GifClock(fps) if fmt == 'gif' else FrameClock(fps)
+
+
+def loop_first_frame(plan, clock):
+    """Index of the first frame of clock that is part of the steady-state loop."""
+    first = max(0, int(plan.loop_start * clock.fps))
+    while clock.time(first) <= plan.loop_start:
+        first += 1
+    return first
+
+
+def auto_loop_frames(plan, clock, max_nudge=LOOP_NUDGE):
+    """
+    Export length for a seamless loop: the intro (if any) plus one loop, in
+    whole frames of clock. Returns (total_frames, plan, seamless) - export
+    with the plan returned, its scroll speed may be nudged by up to
+    max_nudge (see solve_loop; 0 keeps it exact).
+    
+    Never longer than MAX_EXPORT_SECONDS: a longer loop is cut at the limit
+    and seamless is False.
+    """
+    limit = clock.frame_count(MAX_EXPORT_SECONDS)
+    period, plan = solve_loop(plan, clock, max_nudge)
+    total = loop_first_frame(plan, clock) + period
+    return min(total, limit), plan, total <= limit
+
+
+def render_export_frames(renderer, plan, clock, total_frames, fmt, workers=1, ring=None):
+    """
+    Yield the total_frames export frames, at the times clock shows them, in order.
+    
+    Once the intro is over the animation is periodic, so when the loop is a
+    whole number of frames only the intro and one loop period are rendered;
+    the rest of the export replays the loop frames from a FrameStore (RAM up
+    to LOOP_CACHE_BUDGET, then a temp file up to LOOP_SPILL_LIMIT). ring is
+    passed on to render_frames.
+    """
+    frame_times = (clock.time(i) for i in range(total_frames))
+    
+    loop_first = loop_first_frame(plan, clock)
+    period, _ = solve_loop(plan, clock)
+    frame_bytes = plan.canvas_width * plan.band_height * 4
+    if loop_first + period >= total_frames or period * frame_bytes > LOOP_CACHE_BUDGET + LOOP_SPILL_LIMIT:
+        yield from render_frames(renderer, plan, frame_times, fmt, workers, ring=ring)
+        return
+    
+    shape = (plan.band_height, plan.canvas_width, 4)
+    with FrameStore(shape, period, images=fmt == 'gif') as loop_frames:
+        rendered = render_frames(renderer, plan, itertools.islice(frame_times, loop_first + period), fmt, workers, ring=ring)
+        for i, frame in enumerate(rendered):
+            if i >= loop_first:
+                # Ring frames get overwritten, the store needs its own copy
+                loop_frames.append(frame, copy=ring is not None)
+            yield frame
+        
+        for i in range(loop_first + period, total_frames):
+            yield loop_frames[(i - loop_first) % period]
+
+
+def bounding_box(mask):
+    """(x0, y0, x1, y1) of the True pixels in a 2D bool array, or None if there are none."""
+    import numpy as np
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
+class Mp4Writer:
+    """
+    Writes RGBA frames (arrays or images) into a cv2.VideoWriter. Split in
+    two halves so ExportPipeline can run them on separate threads:
+    convert() flattens a frame over black into a BGR buffer and encode()
+    hands that buffer to OpenCV; write() does both.
+    
+    BGR buffers are recycled once encode() is done with them, so after the
+    first few frames (as many as are in flight between the two halves) the
+    conversion doesn't allocate at all. Frames passed in are never modified.
+    
+    band=(y, height) means frames are only that horizontal band of the
+    canvas (see BannerRenderer.draw_frame); the rest of the buffers stays black.
+    """
+    def __init__(self, filename, fps, size, band=None):
+        import cv2
+        import numpy as np
+        self.cv2 = cv2
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.out = cv2.VideoWriter(filename, fourcc, fps, size)
+        if not self.out.isOpened():
+            raise IOError(f"Could not open video writer for:\n{filename}")
+        
+        self.size = size
+        width, height = size
+        self.band_y, self.band_height = band or (0, height)
+        self.premultiplied = np.empty((self.band_height, width, 4), np.uint8)
+        self.free = queue.SimpleQueue()
+    
+    def to_bgr(self, frame, bgr):
+        """
+        Composite an RGBA frame (band) over black into the BGR buffer bgr,
+        channels swapped for OpenCV. Compositing over black is just
+        premultiplying by alpha, and OpenCV rounds that exactly like PIL's
+        masked paste did.
+        """
+        import numpy as np
+        cv2 = self.cv2
+        cv2.cvtColor(np.asarray(frame), cv2.COLOR_RGBA2mRGBA, dst=self.premultiplied)
+        cv2.cvtColor(self.premultiplied, cv2.COLOR_RGBA2BGR,
+            dst=bgr[self.band_y:self.band_y + self.band_height])
+        return bgr
+    
+    def convert(self, frame):
+        import numpy as np
+        try:
+            bgr = self.free.get_nowait()
+        except queue.Empty:
+            width, height = self.size
+            bgr = np.zeros((height, width, 3), np.uint8)
+        return self.to_bgr(frame, bgr)
+    
+    def encode(self, bgr):
+        # VideoWriter.write is done with the buffer once it returns
+        self.out.write(bgr)
+        self.free.put(bgr)
+    
+    def write(self, frame):
+        self.encode(self.convert(frame))
+    
+    def close(self):
+        self.out.release()
+
+
+class GifWriter:
+    """
+    Writes an animated GIF one frame at a time, so memory use doesn't grow
+    with the number of frames (unlike Image.save(save_all=True), which keeps
+    every frame around until the end). Only the last frame is held back, to
+    merge identical consecutive frames and pick its disposal method.
+    
+    With a fixed palette (see BannerRenderer.build_gif_palette) it is written
+    once as the global color table and frames are mapped to it through an
+    RGB -> index lookup table, which is much faster than quantizing every
+    frame and keeps the flicker colours identical from frame to frame. Each
+    frame is then stored as a delta: only the rectangle that changed since
+    the previous frame, with unchanged pixels left transparent.
+    
+    Without a palette each frame gets its own adaptive palette and is stored
+    whole (cropped to its opaque area, disposed to transparent).
+    
+    band=(y, height) means frames are only that horizontal band of the
+    canvas; they're stored at that offset and the rest stays transparent.
+    
+    duration is ms per frame, or a function giving frame i's delay in ms
+    (e.g. GifClock.delay_ms) when delays vary.
+    """
+    def __init__(self, filename, size, duration, loop=0, palette=None, band=None):
+        self.size = size
+        self.band_y, self.band_height = band or (0, size[1])
+        self.duration = duration if callable(duration) else (lambda i: duration)
+        self.frames = 0  # frames encoded so far
+        self.pending = None
+        self.palette = palette
+        self.fp = open(filename, 'wb')
+        
+        # Header + Logical Screen Descriptor, then the NETSCAPE looping extension
+        width, height = size
+        if palette:
+            self.init_palette_lookup(palette)
+            table_bits = max(1, (len(palette) - 1).bit_length())
+            flags = 0x80 | (table_bits - 1)
+            table = bytearray(3 << table_bits)
+            for i, rgb in enumerate(palette):
+                table[i * 3:i * 3 + 3] = bytes(rgb)
+            self.fp.write(b"GIF89a" + struct.pack("<HHBBB", width, height, flags, 0, 0) + table)
         else:
-            flicker_cycle = 0
+            self.fp.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        self.fp.write(b"!\xff\x0bNETSCAPE2.0" + struct.pack("<BBHB", 3, 1, loop, 0))
+    
+    def init_palette_lookup(self, palette):
+        import numpy as np
+        # Index 0 is the transparent colour; 255 marks "not looked up yet"
+        self.palette_rgb = np.array(palette[1:], np.int32)
+        self.lookup = np.full(1 << 24, 255, np.uint8)
+        # What the decoder is showing (in the band) before the pending frame is drawn
+        self.base = np.zeros((self.band_height, self.size[0]), np.uint8)
+    
+    def quantize(self, img):
+        """Convert an RGBA frame to 'P' with an adaptive palette, returning (image, transparent index or None)."""
+        p_img = img.convert("P", palette=Image.Palette.ADAPTIVE)
+        transparency = None
+        if p_img.palette.mode == "RGBA":
+            for rgba, index in p_img.palette.colors.items():
+                if rgba[3] == 0:
+                    transparency = index
+                    break
+        return p_img, transparency
+    
+    def map_to_palette(self, img):
+        """Map an RGBA image to a uint8 array of indices into the fixed palette."""
+        import numpy as np
+        # Whole pixels as R | G << 8 | B << 16 | A << 24
+        pixels = np.asarray(img).view('<u4')[..., 0]
+        key = pixels & 0xFFFFFF
+        
+        # Colours seen for the first time get their nearest palette entry
+        # (alpha is ignored - GIF only has on/off transparency)
+        indices = self.lookup[key]
+        missing = indices == 255
+        if missing.any():
+            new_keys = np.unique(key[missing])
+            rgb = np.stack([new_keys & 0xFF, (new_keys >> 8) & 0xFF, new_keys >> 16], axis=1).astype(np.int32)
+            dist = ((rgb[:, None, :] - self.palette_rgb[None, :, :]) ** 2).sum(axis=2)
+            self.lookup[new_keys] = dist.argmin(axis=1) + 1
+            indices = self.lookup[key]
+        
+        indices[pixels < (1 << 24)] = 0  # alpha == 0
+        return indices
+    
+    def index_frame(self, img):
+        """Palette index array for an RGBA frame band (only its opaque area gets mapped)."""
+        import numpy as np
+        frame = np.zeros((self.band_height, self.size[0]), np.uint8)
+        bbox = img.getchannel('A').getbbox()
+        if bbox:
+            frame[bbox[1]:bbox[3], bbox[0]:bbox[2]] = self.map_to_palette(img.crop(bbox))
+        return frame
+    
+    def convert(self, img):
+        """Pixel work for a frame: palette indices with a fixed palette, else the image as is."""
+        return self.index_frame(img) if self.palette else img
+    
+    def write(self, img):
+        self.encode(self.convert(img))
+    
+    def encode(self, frame):
+        """Add a converted frame (see convert) to the GIF."""
+        data = frame.tobytes()
+        duration = self.duration(self.frames)
+        self.frames += 1
+        
+        # Identical consecutive frames (e.g. the intro blink) are merged into
+        # one longer frame
+        if self.pending and self.pending[0] == data:
+            self.pending[1] += duration
+            return
+        self.flush(frame)
+        self.pending = [data, duration, frame]
+    
+    def flush(self, next_frame=None):
+        if not self.pending:
+            return
+        _, duration, frame = self.pending
+        self.pending = None
         
-        # Find the optimal loop duration
-        if flicker_cycle <= 0:
-            return text_cycle
+        if self.palette:
+            self.write_delta(frame, duration, next_frame)
         else:
-            # Find LCM of both cycle durations for perfect loop
-            return self._find_lcm_duration(text_cycle, flicker_cycle)
+            self.write_cropped(frame, duration)
     
-    def _find_lcm_duration(self, cycle_a, cycle_b, max_loops=10, tolerance=0.05):
+    def write_cropped(self, img, duration):
+        # Frames are disposed to transparent (disposal=2), so only the
+        # non-transparent bounding box needs to be stored
+        bbox = img.getchannel('A').getbbox()
+        if not bbox:
+            bbox = (0, 0, 1, 1)
+        if bbox != (0, 0) + img.size:
+            img = img.crop(bbox)
+        
+        p_img, transparency = self.quantize(img)
+        params = {'duration': duration, 'disposal': 2, 'include_color_table': True}
+        if transparency is not None:
+            params['transparency'] = transparency
+        self.write_image(p_img, (bbox[0], bbox[1] + self.band_y), params)
+    
+    def write_delta(self, frame, duration, next_frame):
         """
-        Find the smallest duration where both cycles align within tolerance.
-        This ensures smooth looping for both animations.
-        
-        Args:
-            cycle_a: First cycle duration (e.g., text scroll)
-            cycle_b: Second cycle duration (e.g., background flicker)
-            max_loops: Maximum number of cycle_a repetitions to check
-            tolerance: Acceptable alignment error as a fraction of cycle_b
-        
-        Returns:
-            Duration in seconds for optimal loop
+        Write an index frame as the changed rectangle over self.base, with
+        unchanged pixels as transparent (index 0). Its disposal is picked so
+        that next_frame can in turn be drawn as a delta:
+          1 (keep)     - next_frame doesn't turn any visible pixel transparent
+          2 (clear)    - it does, but only inside this frame's rectangle
+          2, grown     - otherwise, with the rectangle grown to everything
+                         visible; also used for the last frame so the loop
+                         restarts on an empty canvas
         """
-        if cycle_a <= 0:
-            return cycle_b
-        if cycle_b <= 0:
-            return cycle_a
-            
-        # Check multiples of cycle_a to find one that aligns with cycle_b
-        for n in range(1, max_loops + 1):
-            duration = cycle_a * n
-            remainder = duration % cycle_b
-            if remainder < (cycle_b * tolerance) or remainder > (cycle_b * (1 - tolerance)):
-                return duration
+        import numpy as np
+        changed = frame != self.base
+        rect = bounding_box(changed) or (0, 0, 1, 1)
         
-        # and if we can't find a match, just use the text cycle
-        return cycle_a
-
-# Dark and light theme defs
-THEMES = {
-    'dark': {
-        'bg': '#1a1a1a',
-        'bg_secondary': '#252525',
-        'bg_tertiary': '#2d2d2d',
-        'fg': '#e0e0e0',
-        'fg_dim': '#888888',
-        'accent': '#FFEF00',
-        'accent_dark': '#C4B500',
-        'accent_hover': '#FFE500',
-        'border': '#3d3d3d',
-        'entry_bg': '#1f1f1f',
-        'button_bg': '#333333',
-        'button_hover': '#404040',
-        'preview_bg': '#0a0a0a',
-        'section_header': '#FFEF00',
-    },
-    'light': {
-        'bg': '#f0f0f0',
-        'bg_secondary': '#ffffff',
-        'bg_tertiary': '#e8e8e8',
-        'fg': '#1a1a1a',
-        'fg_dim': '#666666',
-        'accent': '#C4A000',
-        'accent_dark': '#8B7500',
-        'accent_hover': '#DAAE00',
-        'border': '#cccccc',
-        'entry_bg': '#ffffff',
-        'button_bg': '#e0e0e0',
-        'button_hover': '#d0d0d0',
-        'preview_bg': '#2a2a2a',
-        'section_header': '#8B7500',
-    }
-}
+        if next_frame is None:
+            disposal, next_base = 2, None
+        else:
+            clears = next_frame == 0
+            if not (clears & (frame != 0)).any():
+                disposal, next_base = 1, frame
+            else:
+                disposal, next_base = 2, frame.copy()
+                next_base[rect[1]:rect[3], rect[0]:rect[2]] = 0
+                if (clears & (next_base != 0)).any():
+                    next_base = None
+        
+        if next_base is None:
+            # Grow the rectangle to cover everything visible so disposal clears it all
+            visible = bounding_box(frame != 0)
+            if visible:
+                rect = (min(rect[0], visible[0]), min(rect[1], visible[1]),
+                        max(rect[2], visible[2]), max(rect[3], visible[3]))
+        
+        x0, y0, x1, y1 = rect
+        data = frame[y0:y1, x0:x1].copy()
+        data[~changed[y0:y1, x0:x1]] = 0
+        
+        params = {'duration': duration, 'disposal': disposal, 'transparency': 0}
+        self.write_image(Image.fromarray(data, 'P'), (x0, y0 + self.band_y), params)
+        self.base = next_base if next_base is not None else np.zeros_like(frame)
+    
+    def write_image(self, p_img, offset, params):
+        for chunk in GifImagePlugin.getdata(p_img, offset=offset, **params):
+            self.fp.write(chunk)
+    
+    def close(self):
+        if self.fp.closed:
+            return
+        try:
+            self.flush()
+            self.fp.write(b";")  # trailer
+        finally:
+            self.fp.close()
 
 
-class PaydayApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("PAYDAY 2 — Assault Banner Generator")
-        self.root.geometry("1280x800")
-        self.root.minsize(1000, 700)
-        
-        # Theme state
-        self.current_theme = 'dark'
-        self.theme = THEMES[self.current_theme]
-        
-        self.config = {
-            'custom_text': 'POLICE ASSAULT IN PROGRESS',
-            'threat_level': 'Normal (1 skull)',
-            'color': '#FFEF00',
-            'bg_color_1': '#C4B500',
-            'bg_color_2': '#645C00',
-            'auto_bg_color': True,  # Auto-generate background colors from main color
-            'start_flicker': True,
-            'start_flicker_duration': 2.0,  # Duration of the blinking intro animation
-            'bg_flicker_speed': 1.0,
-            'canvas_width': 720,
-            'canvas_height_mode': 'fit',
-            'fit_padding': 10
+class ExportStage:
+    """Throughput counters for one ExportPipeline stage."""
+    def __init__(self, name):
+        self.name = name
+        self.frames = 0
+        self.busy = 0.0     # seconds spent doing the work
+        self.starved = 0.0  # seconds waiting for input
+        self.blocked = 0.0  # seconds waiting for room downstream (backpressure)
+    
+    def summary(self):
+        return {
+            'frames': self.frames,
+            'fps': round(self.frames / self.busy, 1) if self.busy > 0 else None,
+            'busy_s': round(self.busy, 3),
+            'starved_s': round(self.starved, 3),
+            'blocked_s': round(self.blocked, 3),
         }
-        
-        self.renderer = BannerRenderer(self.config)
-        self.preview_running = True
-        self.start_time = time.time()
-        
-        self.setup_styles()
-        self.build_ui()
-        self.animate_preview()
-        
-        # Handle window close
-        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
-        
-    def on_close(self):
-        self.preview_running = False
-        self.root.destroy()
-
-    def setup_styles(self):
-        """Configure ttk styles for the current theme."""
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
-        t = self.theme
-        
-        # Configure root
-        self.root.configure(bg=t['bg'])
-        
-        # Frame styles
-        self.style.configure('TFrame', background=t['bg'])
-        self.style.configure('Secondary.TFrame', background=t['bg_secondary'])
-        self.style.configure('Card.TFrame', background=t['bg_secondary'])
-        
-        # Label styles
-        self.style.configure('TLabel', 
-            background=t['bg_secondary'], 
-            foreground=t['fg'],
-            font=('Segoe UI', 10))
-        self.style.configure('Header.TLabel',
-            background=t['bg'],
-            foreground=t['accent'],
-            font=('Segoe UI', 14, 'bold'))
-        self.style.configure('Section.TLabel',
-            background=t['bg_secondary'],
-            foreground=t['section_header'],
-            font=('Segoe UI', 11, 'bold'))
-        self.style.configure('Dim.TLabel',
-            background=t['bg_secondary'],
-            foreground=t['fg_dim'],
-            font=('Segoe UI', 9))
-            
-        # Entry styles
-        self.style.configure('TEntry',
-            fieldbackground=t['entry_bg'],
-            foreground=t['fg'],
-            insertcolor=t['fg'],
-            borderwidth=1)
-        self.style.map('TEntry',
-            fieldbackground=[('focus', t['entry_bg'])],
-            bordercolor=[('focus', t['accent'])])
-            
-        # Combobox styles
-        self.style.configure('TCombobox',
-            fieldbackground=t['entry_bg'],
-            background=t['button_bg'],
-            foreground=t['fg'],
-            arrowcolor=t['accent'])
-        self.style.map('TCombobox',
-            fieldbackground=[('readonly', t['entry_bg'])],
-            selectbackground=[('readonly', t['accent'])],
-            selectforeground=[('readonly', t['bg'])])
-            
-        # Button styles
-        self.style.configure('TButton',
-            background=t['button_bg'],
-            foreground=t['fg'],
-            font=('Segoe UI', 10),
-            padding=(12, 6))
-        self.style.map('TButton',
-            background=[('active', t['button_hover']), ('pressed', t['accent_dark'])],
-            foreground=[('active', t['fg'])])
-            
-        # Accent button
-        self.style.configure('Accent.TButton',
-            background=t['accent'],
-            foreground='#000000',
-            font=('Segoe UI', 11, 'bold'),
-            padding=(20, 10))
-        self.style.map('Accent.TButton',
-            background=[('active', t['accent_hover']), ('pressed', t['accent_dark'])])
-            
-        # Checkbutton
-        self.style.configure('TCheckbutton',
-            background=t['bg_secondary'],
-            foreground=t['fg'],
-            font=('Segoe UI', 10))
-        self.style.map('TCheckbutton',
-            background=[('active', t['bg_secondary'])])
-            
-        # Radiobutton
-        self.style.configure('TRadiobutton',
-            background=t['bg_secondary'],
-            foreground=t['fg'],
-            font=('Segoe UI', 10))
-        self.style.map('TRadiobutton',
-            background=[('active', t['bg_secondary'])])
-            
-        # Scale
-        self.style.configure('TScale',
-            background=t['bg_secondary'],
-            troughcolor=t['bg_tertiary'])
-            
-        # Spinbox
-        self.style.configure('TSpinbox',
-            fieldbackground=t['entry_bg'],
-            background=t['button_bg'],
-            foreground=t['fg'],
-            arrowcolor=t['accent'])
-            
-        # Progressbar
-        self.style.configure('TProgressbar',
-            background=t['accent'],
-            troughcolor=t['bg_tertiary'])
-        
-    def build_ui(self):
-        """Build the main UI layout."""
-        t = self.theme
-        
-        # Header bar
-        header = ttk.Frame(self.root, style='TFrame')
-        header.pack(fill='x', padx=15, pady=(15, 10))
-        
-        # Title with Payday styling
-        title_frame = ttk.Frame(header, style='TFrame')
-        title_frame.pack(side='left')
-        
-        title_lbl = tk.Label(header, 
-            text="◢ PAYDAY 2 — ASSAULT BANNER GENERATOR ◣",
-            bg=t['bg'], 
-            fg=t['accent'],
-            font=('Segoe UI', 16, 'bold'))
-        title_lbl.pack(side='left')
-        
-        # Theme toggle
-        theme_frame = ttk.Frame(header, style='TFrame')
-        theme_frame.pack(side='right')
-        
-        self.theme_var = tk.StringVar(value=self.current_theme)
-        
-        dark_rb = ttk.Radiobutton(theme_frame, text="◐ Dark", 
-            variable=self.theme_var, value='dark',
-            command=self.toggle_theme)
-        dark_rb.pack(side='left', padx=5)
-        
-        light_rb = ttk.Radiobutton(theme_frame, text="◑ Light",
-            variable=self.theme_var, value='light', 
-            command=self.toggle_theme)
-        light_rb.pack(side='left', padx=5)
-        
-        # Main content area (Side by Side)
-        main_container = ttk.Frame(self.root, style='TFrame')
-        main_container.pack(fill='both', expand=True, padx=15, pady=(0, 15))
-        
-        # Left panel - Controls (scrollable)
-        left_panel = ttk.Frame(main_container, style='TFrame')
-        left_panel.pack(side='left', fill='y', padx=(0, 10))
-        
-        # Create scrollable canvas for controls
-        controls_canvas = tk.Canvas(left_panel, bg=t['bg'], 
-            highlightthickness=0, width=380)
-        controls_scrollbar = ttk.Scrollbar(left_panel, orient='vertical',
-            command=controls_canvas.yview)
-        self.controls_frame = ttk.Frame(controls_canvas, style='TFrame')
-        
-        self.controls_frame.bind('<Configure>', 
-            lambda e: controls_canvas.configure(scrollregion=controls_canvas.bbox('all')))
-        controls_canvas.create_window((0, 0), window=self.controls_frame, anchor='nw')
-        controls_canvas.configure(yscrollcommand=controls_scrollbar.set)
-        
-        controls_canvas.pack(side='left', fill='both', expand=True)
-        controls_scrollbar.pack(side='right', fill='y')
-        
-        # Enable mousewheel scrolling
-        def on_mousewheel(event):
-            controls_canvas.yview_scroll(int(-1*(event.delta/120)), 'units')
-        controls_canvas.bind_all('<MouseWheel>', on_mousewheel)
-        
-        # Build control sections
-        self.build_banner_section()
-        self.build_color_section()
-        self.build_animation_section()
-        self.build_canvas_section()
-        self.build_export_section()
-        
-        # Right panel (preview)
-        right_panel = ttk.Frame(main_container, style='Secondary.TFrame')
-        right_panel.pack(side='right', fill='both', expand=True)
-        
-        self.build_preview_section(right_panel)
-        
-    def create_section(self, parent, title, icon=""):
-        """Create a styled section card."""
-        t = self.theme
-        
-        # Card container
-        card = tk.Frame(parent, bg=t['bg_secondary'], 
-            highlightbackground=t['border'], highlightthickness=1)
-        card.pack(fill='x', pady=(0, 10))
-        
-        # Section header
-        header = tk.Frame(card, bg=t['bg_secondary'])
-        header.pack(fill='x', padx=12, pady=(10, 5))
-        
-        tk.Label(header, text=f"{icon} {title}",
-            bg=t['bg_secondary'], fg=t['section_header'],
-            font=('Segoe UI', 11, 'bold')).pack(side='left')
-        
-        # Content frame
-        content = ttk.Frame(card, style='Secondary.TFrame')
-        content.pack(fill='x', padx=12, pady=(0, 12))
-        
-        return content
-        
-    def build_banner_section(self):
-        """Build the Banner Content section."""
-        content = self.create_section(self.controls_frame, "BANNER CONTENT", "▶")
-        
-        # Text input
-        ttk.Label(content, text="Banner Text").pack(anchor='w')
-        self.text_var = tk.StringVar(value=self.config['custom_text'])
-        self.text_var.trace('w', self.update_config)
-        text_entry = ttk.Entry(content, textvariable=self.text_var, width=45)
-        text_entry.pack(fill='x', pady=(2, 10))
-        
-        # Threat level
-        ttk.Label(content, text="Threat Level").pack(anchor='w')
-        self.threat_var = tk.StringVar(value=self.config['threat_level'])
-        self.threat_var.trace('w', self.update_config)
-        threat_levels = [
-            "Easy (0 skulls)", "Normal (1 skull)", "Hard (2 skulls)", "Overkill (3 skulls)",
-            "Mayhem (4 skulls)", "Death Wish (5 skulls)", "Death Sentence (6 skulls)",
-            "Juggernaut (7 skulls)", "Apocalypse (8 skulls)", "Cataclysmic (9 skulls)",
-            "Armageddon (10 skulls)"
-        ]
-        threat_combo = ttk.Combobox(content, textvariable=self.threat_var,
-            values=threat_levels, state='readonly', width=30)
-        threat_combo.pack(fill='x', pady=(2, 0))
-        
-    def build_color_section(self):
-        """Build the Color Scheme section."""
-        t = self.theme
-        content = self.create_section(self.controls_frame, "COLOR SCHEME", "◆")
-        
-        # Helper to convert hex to RGB and back
-        def hex_to_rgb(hex_color):
-            return tuple(int(hex_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
-        
-        def rgb_to_hex(rgb):
-            return '#{:02x}{:02x}{:02x}'.format(*rgb)
-        
-        def darken_color(hex_color, factor):
-            """Darken a color by a factor (0.0 to 1.0)."""
-            r, g, b = hex_to_rgb(hex_color)
-            return rgb_to_hex((int(r * factor), int(g * factor), int(b * factor)))
-        
-        def create_color_row(parent, label, config_key, initial_color, is_bg=False):
-            row = ttk.Frame(parent, style='Secondary.TFrame')
-            row.pack(fill='x', pady=3)
-            
-            ttk.Label(row, text=label, width=12).pack(side='left')
-            
-            # Color swatch button
-            btn = tk.Button(row, width=8, height=1,
-                bg=initial_color, activebackground=initial_color,
-                relief='solid', borderwidth=1,
-                cursor='hand2')
-            btn.pack(side='left', padx=(5, 10))
-            
-            # Hex label
-            hex_lbl = tk.Label(row, text=initial_color,
-                bg=t['bg_secondary'], fg=t['fg_dim'],
-                font=('Consolas', 9))
-            hex_lbl.pack(side='left')
-            
-            def choose():
-                # If this is a BG color and auto_bg_color is enabled, don't allow choosing
-                if is_bg and self.auto_bg_var.get():
-                    messagebox.showinfo("Auto BG Enabled", 
-                        "Disable 'Auto BG from Main' to manually set background colors.")
-                    return
-                    
-                color = colorchooser.askcolor(color=self.config[config_key])[1]
-                if color:
-                    self.config[config_key] = color
-                    btn.config(bg=color, activebackground=color)
-                    hex_lbl.config(text=color)
-                    
-                    # If this is the main color and auto-BG is enabled, update BG colors
-                    if config_key == 'color' and self.auto_bg_var.get():
-                        self.auto_generate_bg_colors()
-                    
-                    self.renderer = BannerRenderer(self.config)
-            
-            btn.config(command=choose)
-            return btn, hex_lbl, row
-        
-        # Main color row with auto-BG checkbox
-        main_row = ttk.Frame(content, style='Secondary.TFrame')
-        main_row.pack(fill='x', pady=3)
-        
-        ttk.Label(main_row, text="Main Color", width=12).pack(side='left')
-        
-        self.color_btn = tk.Button(main_row, width=8, height=1,
-            bg=self.config['color'], activebackground=self.config['color'],
-            relief='solid', borderwidth=1, cursor='hand2')
-        self.color_btn.pack(side='left', padx=(5, 10))
-        
-        self.color_lbl = tk.Label(main_row, text=self.config['color'],
-            bg=t['bg_secondary'], fg=t['fg_dim'], font=('Consolas', 9))
-        self.color_lbl.pack(side='left')
-        
-        def choose_main_color():
-            color = colorchooser.askcolor(color=self.config['color'])[1]
-            if color:
-                self.config['color'] = color
-                self.color_btn.config(bg=color, activebackground=color)
-                self.color_lbl.config(text=color)
-                
-                # If auto-BG is enabled, update BG colors
-                if self.auto_bg_var.get():
-                    self.auto_generate_bg_colors()
-                
-                self.renderer = BannerRenderer(self.config)
-        
-        self.color_btn.config(command=choose_main_color)
-        
-        # Auto-generate BG checkbox
-        auto_row = ttk.Frame(content, style='Secondary.TFrame')
-        auto_row.pack(fill='x', pady=(5, 3))
-        
-        self.auto_bg_var = tk.BooleanVar(value=self.config.get('auto_bg_color', True))
-        auto_cb = ttk.Checkbutton(auto_row, text="Auto BG from Main",
-            variable=self.auto_bg_var, command=self.on_auto_bg_toggle)
-        auto_cb.pack(side='left')
-        
-        ttk.Label(auto_row, text="(auto-generates flicker colors)", 
-            style='Dim.TLabel').pack(side='left', padx=(5, 0))
-        
-        # Background color rows
-        self.bg_c1_btn, self.bg_c1_lbl, self.bg_c1_row = create_color_row(
-            content, "BG Pulse A", 'bg_color_1', self.config['bg_color_1'], is_bg=True)
-        self.bg_c2_btn, self.bg_c2_lbl, self.bg_c2_row = create_color_row(
-            content, "BG Pulse B", 'bg_color_2', self.config['bg_color_2'], is_bg=True)
-        
-        # Apply initial auto-generate if enabled
-        if self.auto_bg_var.get():
-            self.auto_generate_bg_colors()
-        self.update_bg_button_states()
-    
-    def auto_generate_bg_colors(self):
-        """Generate background flicker colors from main color."""
-        main_hex = self.config['color']
-        
-        # Convert to RGB
-        r = int(main_hex[1:3], 16)
-        g = int(main_hex[3:5], 16)
-        b = int(main_hex[5:7], 16)
-        
-        # BG Pulse A: 80% brightness
-        bg1_r = int(r * 0.80)
-        bg1_g = int(g * 0.80)
-        bg1_b = int(b * 0.80)
-        
-        # BG Pulse B: 40% brightness
-        bg2_r = int(r * 0.40)
-        bg2_g = int(g * 0.40)
-        bg2_b = int(b * 0.40)
-        
-        bg1_hex = '#{:02x}{:02x}{:02x}'.format(bg1_r, bg1_g, bg1_b)
-        bg2_hex = '#{:02x}{:02x}{:02x}'.format(bg2_r, bg2_g, bg2_b)
-        
-        self.config['bg_color_1'] = bg1_hex
-        self.config['bg_color_2'] = bg2_hex
-        
-        # Update UI
-        self.bg_c1_btn.config(bg=bg1_hex, activebackground=bg1_hex)
-        self.bg_c1_lbl.config(text=bg1_hex)
-        self.bg_c2_btn.config(bg=bg2_hex, activebackground=bg2_hex)
-        self.bg_c2_lbl.config(text=bg2_hex)
-        
-        self.renderer = BannerRenderer(self.config)
-    
-    def on_auto_bg_toggle(self):
-        """Handle auto-BG checkbox toggle."""
-        self.config['auto_bg_color'] = self.auto_bg_var.get()
-        if self.auto_bg_var.get():
-            self.auto_generate_bg_colors()
-        self.update_bg_button_states()
-    
-    def update_bg_button_states(self):
-        """Enable/disable background color buttons based on auto-BG setting."""
-        if self.auto_bg_var.get():
-            # Disable buttons - make them look inactive
-            self.bg_c1_btn.config(state='disabled', cursor='arrow')
-            self.bg_c2_btn.config(state='disabled', cursor='arrow')
-        else:
-            # Enable buttons
-            self.bg_c1_btn.config(state='normal', cursor='hand2')
-            self.bg_c2_btn.config(state='normal', cursor='hand2')
-
-    def build_animation_section(self):
-        """Build the Animation section."""
-        t = self.theme
-        content = self.create_section(self.controls_frame, "ANIMATION", "⚡")
-        
-        # Start flicker checkbox
-        self.flicker_var = tk.BooleanVar(value=self.config['start_flicker'])
-        self.flicker_var.trace('w', self.update_config)
-        flicker_cb = ttk.Checkbutton(content, text="Enable Start Flicker Animation",
-            variable=self.flicker_var)
-        flicker_cb.pack(anchor='w', pady=(0, 5))
-        
-        # Flicker duration slider
-        flicker_dur_frame = ttk.Frame(content, style='Secondary.TFrame')
-        flicker_dur_frame.pack(fill='x', pady=(0, 10))
-        
-        ttk.Label(flicker_dur_frame, text="Flicker Duration (s)", width=16).pack(side='left')
-        
-        self.flicker_dur_var = tk.DoubleVar(value=self.config['start_flicker_duration'])
-        self.flicker_dur_var.trace('w', self.update_config)
-        
-        flicker_dur_spin = ttk.Spinbox(flicker_dur_frame, from_=0.5, to=10.0,
-            textvariable=self.flicker_dur_var, width=6, increment=0.5)
-        flicker_dur_spin.pack(side='left', padx=(5, 0))
-        
-        self.flicker_dur_lbl = tk.Label(flicker_dur_frame, text="sec",
-            bg=t['bg_secondary'], fg=t['fg_dim'],
-            font=('Segoe UI', 9))
-        self.flicker_dur_lbl.pack(side='left', padx=(5, 0))
-        
-        # Speed slider with value label
-        speed_frame = ttk.Frame(content, style='Secondary.TFrame')
-        speed_frame.pack(fill='x')
-        
-        ttk.Label(speed_frame, text="BG Flicker Speed").pack(anchor='w')
-        
-        slider_row = ttk.Frame(speed_frame, style='Secondary.TFrame')
-        slider_row.pack(fill='x', pady=(2, 0))
-        
-        self.speed_var = tk.DoubleVar(value=self.config['bg_flicker_speed'])
-        self.speed_var.trace('w', self.update_config)
-        
-        speed_slider = ttk.Scale(slider_row, from_=0.0, to=5.0,
-            variable=self.speed_var, length=250)
-        speed_slider.pack(side='left', fill='x', expand=True)
-        
-        self.speed_lbl = tk.Label(slider_row, text=f"{self.config['bg_flicker_speed']:.1f}x",
-            bg=t['bg_secondary'], fg=t['accent'],
-            font=('Consolas', 10, 'bold'), width=5)
-        self.speed_lbl.pack(side='right', padx=(10, 0))
-        
-        # Update speed label when slider changes
-        def update_speed_label(*args):
+
+
+class ExportPipeline:
+    """
+    Runs an export as three stages joined by bounded queues: render (the
+    frame iterator, which may fan out to worker processes) and convert each
+    on their own thread, encode on the calling thread. Every stage works on
+    a different frame at the same time, so the export takes about as long as
+    the slowest stage rather than the sum of all three, and a full queue
+    makes the stages before it wait instead of piling up frames.
+    
+    stages holds an ExportStage per stage; `fps` there is frames per second
+    of busy time, i.e. how fast that stage would go on its own.
+    """
+    POLL = 0.1  # seconds between checks for a failed stage while waiting on a queue
+    
+    def __init__(self, frames, convert, encode, queue_size=EXPORT_QUEUE_SIZE):
+        self.frames = frames
+        self.convert = convert
+        self.encode = encode
+        self.rendered = queue.Queue(maxsize=queue_size)
+        self.converted = queue.Queue(maxsize=queue_size)
+        self.stages = [ExportStage('render'), ExportStage('convert'), ExportStage('encode')]
+        self.error = None
+        self.stopped = False
+    
+    def put(self, q, item, stage):
+        start = time.perf_counter()
+        while not self.stopped:
             try:
-                self.speed_lbl.config(text=f"{self.speed_var.get():.1f}x")
-            except:
-                pass
-        self.speed_var.trace('w', update_speed_label)
-        
-    def build_canvas_section(self):
-        """Build the Canvas Settings section."""
-        content = self.create_section(self.controls_frame, "CANVAS OUTPUT", "▣")
-        
-        # Width
-        width_row = ttk.Frame(content, style='Secondary.TFrame')
-        width_row.pack(fill='x', pady=(0, 8))
-        
-        ttk.Label(width_row, text="Width (px)", width=12).pack(side='left')
-        self.width_var = tk.IntVar(value=self.config['canvas_width'])
-        self.width_var.trace('w', self.update_config)
-        width_spin = ttk.Spinbox(width_row, from_=300, to=4096,
-            textvariable=self.width_var, width=10)
-        width_spin.pack(side='left', padx=(5, 0))
-        
-        # Height mode
-        ttk.Label(content, text="Height Mode").pack(anchor='w')
-        mode_frame = ttk.Frame(content, style='Secondary.TFrame')
-        mode_frame.pack(fill='x', pady=(2, 8))
-        
-        self.height_mode_var = tk.StringVar(value=self.config['canvas_height_mode'])
-        self.height_mode_var.trace('w', self.update_config)
-        
-        ttk.Radiobutton(mode_frame, text="Fixed 1080p",
-            variable=self.height_mode_var, value='fixed').pack(side='left', padx=(0, 15))
-        ttk.Radiobutton(mode_frame, text="Fit to Banner",
-            variable=self.height_mode_var, value='fit').pack(side='left')
-        
-        # Padding
-        pad_row = ttk.Frame(content, style='Secondary.TFrame')
-        pad_row.pack(fill='x')
-        
-        ttk.Label(pad_row, text="Fit Padding", width=12).pack(side='left')
-        self.pad_var = tk.IntVar(value=self.config['fit_padding'])
-        self.pad_var.trace('w', self.update_config)
-        pad_spin = ttk.Spinbox(pad_row, from_=0, to=200,
-            textvariable=self.pad_var, width=10)
-        pad_spin.pack(side='left', padx=(5, 0))
-        
-    def build_export_section(self):
-        """Build the Export section."""
-        t = self.theme
-        content = self.create_section(self.controls_frame, "EXPORT", "◤")
-        
-        # Format and FPS row
-        row1 = ttk.Frame(content, style='Secondary.TFrame')
-        row1.pack(fill='x', pady=(0, 8))
-        
-        ttk.Label(row1, text="Format", width=12).pack(side='left')
-        self.format_var = tk.StringVar(value='mp4')
-        format_combo = ttk.Combobox(row1, textvariable=self.format_var,
-            values=['mp4', 'gif'], state='readonly', width=8)
-        format_combo.pack(side='left', padx=(5, 20))
-        
-        ttk.Label(row1, text="FPS").pack(side='left')
-        self.fps_var = tk.IntVar(value=60)
-        fps_spin = ttk.Spinbox(row1, from_=24, to=144,
-            textvariable=self.fps_var, width=6)
-        fps_spin.pack(side='left', padx=(5, 0))
-        
-        # Duration row
-        row2 = ttk.Frame(content, style='Secondary.TFrame')
-        row2.pack(fill='x', pady=(0, 8))
-        
-        ttk.Label(row2, text="Duration (s)", width=12).pack(side='left')
-        self.duration_var = tk.DoubleVar(value=5.0)
-        dur_spin = ttk.Spinbox(row2, from_=0.5, to=300,
-            textvariable=self.duration_var, width=8, increment=0.5)
-        dur_spin.pack(side='left', padx=(5, 0))
-        
-        # Auto-calculate
-        auto_frame = ttk.Frame(content, style='Secondary.TFrame')
-        auto_frame.pack(fill='x', pady=(0, 12))
-        
-        self.auto_loop_var = tk.BooleanVar(value=False)
-        auto_cb = ttk.Checkbutton(auto_frame, text="Auto-calc GIF loop duration",
-            variable=self.auto_loop_var, command=self.update_est_duration)
-        auto_cb.pack(side='left')
-        
-        self.est_dur_lbl = tk.Label(auto_frame, text="",
-            bg=t['bg_secondary'], fg=t['fg_dim'],
-            font=('Segoe UI', 9))
-        self.est_dur_lbl.pack(side='right')
-        
-        # Export button (prominent)
-        export_btn = ttk.Button(content, text="◢ EXPORT RENDER ◣",
-            style='Accent.TButton', command=self.start_export)
-        export_btn.pack(fill='x', pady=(5, 0))
-        
-    def build_preview_section(self, parent):
-        """Build the Preview panel."""
-        t = self.theme
-        
-        # Preview header
-        header = tk.Frame(parent, bg=t['bg_secondary'])
-        header.pack(fill='x', padx=15, pady=(15, 10))
-        
-        tk.Label(header, text="◆ LIVE PREVIEW",
-            bg=t['bg_secondary'], fg=t['section_header'],
-            font=('Segoe UI', 11, 'bold')).pack(side='left')
-        
-        # Replay button
-        replay_btn = ttk.Button(header, text="↺ Replay",
-            command=self.restart_anim)
-        replay_btn.pack(side='right')
-        
-        # Preview canvas container
-        preview_container = tk.Frame(parent, bg=t['border'])
-        preview_container.pack(fill='both', expand=True, padx=15, pady=(0, 15))
-        
-        self.preview_canvas = tk.Canvas(preview_container,
-            bg=t['preview_bg'], highlightthickness=0)
-        self.preview_canvas.pack(fill='both', expand=True, padx=2, pady=2)
-        
-    def toggle_theme(self):
-        """Switch between dark and light themes."""
-        self.current_theme = self.theme_var.get()
-        self.theme = THEMES[self.current_theme]
-        
-        # Rebuild UI with new theme
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        self.setup_styles()
-        self.build_ui()
-        
-    def update_config(self, *args):
-        """Update configuration from UI variables."""
-        self.config['custom_text'] = self.text_var.get()
-        self.config['threat_level'] = self.threat_var.get()
-        self.config['start_flicker'] = self.flicker_var.get()
-        try:
-            self.config['start_flicker_duration'] = self.flicker_dur_var.get()
-        except: pass
+                q.put(item, timeout=self.POLL)
+                break
+            except queue.Full:
+                continue
+        stage.blocked += time.perf_counter() - start
+    
+    def get(self, q, stage):
+        start = time.perf_counter()
+        while not self.stopped:
+            try:
+                item = q.get(timeout=self.POLL)
+                break
+            except queue.Empty:
+                continue
+        else:
+            item = None
+        stage.starved += time.perf_counter() - start
+        return item
+    
+    def render_stage(self):
+        stage = self.stages[0]
+        frames = iter(self.frames)
         try:
-            self.config['bg_flicker_speed'] = self.speed_var.get()
-        except: pass
+            while not self.stopped:
+                start = time.perf_counter()
+                frame = next(frames, None)
+                stage.busy += time.perf_counter() - start
+                if frame is None:
+                    break
+                stage.frames += 1
+                self.put(self.rendered, frame, stage)
+        except BaseException as e:
+            self.fail(e)
+        finally:
+            if hasattr(frames, 'close'):
+                frames.close()
+            self.put(self.rendered, None, stage)
+    
+    def convert_stage(self):
+        stage = self.stages[1]
         try:
-            self.config['canvas_width'] = self.width_var.get()
-        except: pass
-        self.config['canvas_height_mode'] = self.height_mode_var.get()
+            while True:
+                frame = self.get(self.rendered, stage)
+                if frame is None:
+                    break
+                start = time.perf_counter()
+                converted = self.convert(frame)
+                stage.busy += time.perf_counter() - start
+                stage.frames += 1
+                self.put(self.converted, converted, stage)
+        except BaseException as e:
+            self.fail(e)
+        finally:
+            self.put(self.converted, None, stage)
+    
+    def fail(self, error):
+        if self.error is None:
+            self.error = error
+        self.stopped = True
+    
+    def run(self, progress=None, total=None):
+        """Push every frame through; progress(done, total) is called after each frame is encoded."""
+        threads = [threading.Thread(target=self.render_stage, daemon=True),
+                   threading.Thread(target=self.convert_stage, daemon=True)]
+        for t in threads:
+            t.start()
+        
+        stage = self.stages[2]
         try:
-            self.config['fit_padding'] = self.pad_var.get()
-        except: pass
-        
-        self.renderer = BannerRenderer(self.config)
-        self.update_est_duration()
+            while True:
+                converted = self.get(self.converted, stage)
+                if converted is None:
+                    break
+                start = time.perf_counter()
+                self.encode(converted)
+                stage.busy += time.perf_counter() - start
+                stage.frames += 1
+                if progress:
+                    progress(stage.frames, total)
+        except BaseException as e:
+            self.fail(e)
+        finally:
+            self.stopped = True
+            for t in threads:
+                t.join()
+        if self.error is not None:
+            raise self.error
+    
+    def summary(self):
+        return {stage.name: stage.summary() for stage in self.stages}
 
-    def update_est_duration(self):
-        """Update the estimated duration label based on animation settings."""
-        if self.auto_loop_var.get():
-            loop_dur = self.renderer.estimate_loop_duration()
-            
-            if self.config['start_flicker']:
-                # With intro animation: need flicker duration + expand animation + loop
-                flicker_dur = self.config.get('start_flicker_duration', 2.0)
-                expand_dur = 0.45  # Banner expand animation duration
-                total = flicker_dur + expand_dur + loop_dur
-                hint = f"≈ {total:.2f}s (intro + loop)"
-            else:
-                # No intro animation: just the loop duration for seamless looping
-                total = loop_dur
-                hint = f"≈ {total:.2f}s (loop only)"
-            
-            self.est_dur_lbl.config(text=hint)
-            self.duration_var.set(round(total, 2))
-        else:
-            self.est_dur_lbl.config(text="")
 
-    def restart_anim(self):
-        """Restart the preview animation."""
-        self.start_time = time.time()
+class ExportProgress:
+    """
+    Progress of a running export, written by the export thread and read by
+    whoever displays it. Pass it to export_banner as the progress callback,
+    then poll snapshot() at whatever rate suits the display - the export
+    itself never waits on a UI.
+    """
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+    
+    def __call__(self, done, total):
+        with self.lock:
+            self.done, self.total = done, total
+    
+    def snapshot(self):
+        """(done, total, frames per second, seconds left or None)."""
+        with self.lock:
+            done, total = self.done, self.total
+        elapsed = time.perf_counter() - self.start
+        fps = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / fps if fps > 0 else None
+        return done, total, fps, eta
 
-    def animate_preview(self):
-        """Animate the preview canvas."""
-        if not self.preview_running:
-            return
-        
-        try:
-            elapsed = time.time() - self.start_time
-            w = self.config.get('canvas_width', 1920)
-            hm = self.config.get('canvas_height_mode', 'fixed')
-            pad = self.config.get('fit_padding', 50)
-            
-            pil_img = self.renderer.draw_frame(elapsed, w, hm, 0, pad)
-            
-            # Scale to fit preview canvas
-            canvas_w = self.preview_canvas.winfo_width()
-            canvas_h = self.preview_canvas.winfo_height()
-            if canvas_w < 10: canvas_w = 800
-            if canvas_h < 10: canvas_h = 500
-            
-            pil_img.thumbnail((canvas_w - 20, canvas_h - 20))
-            
-            self.tk_img = ImageTk.PhotoImage(pil_img)
-            self.preview_canvas.delete("all")
-            
-            self.preview_canvas.create_image(
-                canvas_w // 2, canvas_h // 2, 
-                image=self.tk_img)
-        except Exception as e:
-            pass  # Silently ignore errors during animation
-            
-        self.root.after(33, self.animate_preview)
 
-    def start_export(self):
-        """Start the export process."""
-        fmt = self.format_var.get()
-        
-        # Ensure exports directory exists
-        if not os.path.isdir(EXPORTS_DIR):
-            try:
-                os.makedirs(EXPORTS_DIR, exist_ok=True)
-            except Exception as e:
-                messagebox.showerror("Export Error", f"Could not create exports folder:\n{e}")
-                return
-        
-        # Generate auto-filename suggestion
-        auto_filename = generate_export_filename(self.config['custom_text'], fmt)
-        default_path = os.path.join(EXPORTS_DIR, auto_filename)
-        
-        file_types = [("MP4 Video", "*.mp4")] if fmt == 'mp4' else [("GIF Image", "*.gif")]
-        filename = filedialog.asksaveasfilename(
-            initialdir=EXPORTS_DIR,
-            initialfile=auto_filename,
-            defaultextension=f".{fmt}",
-            filetypes=file_types
-        )
-        
-        if not filename:
-            return
-        
-        duration = self.duration_var.get()
-        fps = self.fps_var.get()
-        total_frames = int(duration * fps)
-        
-        w = self.config.get('canvas_width', 1920)
-        hm = self.config.get('canvas_height_mode', 'fixed')
-        pad = self.config.get('fit_padding', 50)
-        
-        t = self.theme
-        
-        # Create progress dialog
-        top = tk.Toplevel(self.root)
-        top.title("Exporting...")
-        top.geometry("350x120")
-        top.configure(bg=t['bg_secondary'])
-        top.resizable(False, False)
-        top.transient(self.root)
-        top.grab_set()
-        
-        tk.Label(top, text="◢ RENDERING IN PROGRESS ◣",
-            bg=t['bg_secondary'], fg=t['accent'],
-            font=('Segoe UI', 12, 'bold')).pack(pady=(20, 10))
-        
-        progress = ttk.Progressbar(top, length=280, mode='determinate', maximum=total_frames)
-        progress.pack(pady=10)
-        
-        frame_lbl = tk.Label(top, text=f"0 / {total_frames} frames",
-            bg=t['bg_secondary'], fg=t['fg_dim'],
-            font=('Segoe UI', 9))
-        frame_lbl.pack()
-        
-        self.root.update()
-        
-        def run_render():
-            try:
-                frames = []
-                for i in range(total_frames):
-                    t_sec = i / fps
-                    img = self.renderer.draw_frame(t_sec, w, hm, 0, pad)
-                    
-                    if fmt == 'mp4':
-                        bg = Image.new("RGB", img.size, (0, 0, 0))
-                        bg.paste(img, mask=img.split()[3])
-                        open_cv_image = np.array(bg) 
-                        open_cv_image = open_cv_image[:, :, ::-1].copy() 
-                        frames.append(open_cv_image)
-                    else:
-                        frames.append(img)
-                    
-                    progress['value'] = i + 1
-                    frame_lbl.config(text=f"{i + 1} / {total_frames} frames")
-                    top.update()
-                    
-                if fmt == 'mp4':
-                    h, width = frames[0].shape[:2]
-                    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                    out = cv2.VideoWriter(filename, fourcc, fps, (width, h))
-                    for f in frames:
-                        out.write(f)
-                    out.release()
-                else:
-                    # GIF Export
-                    safe_fps = min(fps, 50) 
-                    frame_dur = int(1000 / safe_fps)
-                    
-                    frames[0].save(
-                        filename,
-                        save_all=True,
-                        append_images=frames[1:],
-                        loop=0,
-                        duration=frame_dur,
-                        disposal=2 
-                    )
-                    
-                messagebox.showinfo("Export Complete", f"Successfully exported to:\n{filename}")
-            except Exception as e:
-                messagebox.showerror("Export Error", str(e))
-            finally:
-                top.destroy()
-                
-        threading.Thread(target=run_render).start()
+def export_banner(renderer, plan, filename, fmt, fps, total_frames, workers=1, progress=None):
+    """
+    Render total_frames frames at fps and write them to filename as mp4 or gif.
+    Frames are counted on the format's clock (export_clock), so a GIF above
+    GIF_MAX_FPS has fewer frames per second than fps; use
+    clock.frame_count() to turn a duration into total_frames.
+    progress(done, total) is called after each frame is written. Returns the
+    per-stage throughput of the export pipeline (see ExportPipeline.summary).
+    """
+    clock = export_clock(fmt, fps)
+    size = (plan.canvas_width, plan.canvas_height)
+    band = (plan.band_y, plan.band_height)
+    if fmt == 'mp4':
+        writer = Mp4Writer(filename, fps, size, band=band)
+    else:
+        writer = GifWriter(filename, size, clock.delay_ms,
+            palette=renderer.build_gif_palette(plan), band=band)
+    
+    ring = None
+    if workers > 1:
+        # Workers hand frames over in shared memory. The convert stage may
+        # still be using the frames in its input queue plus the one it's on
+        ring = FrameRing.for_plan(plan, workers * 2, hold=EXPORT_QUEUE_SIZE + 1)
+    
+    frames = render_export_frames(renderer, plan, clock, total_frames, fmt, workers, ring)
+    pipeline = ExportPipeline(frames, writer.convert, writer.encode)
+    try:
+        pipeline.run(progress, total_frames)
+    finally:
+        writer.close()
+        if ring is not None:
+            # Safe now: the pipeline's threads are done with every frame
+            ring.close()
+    return pipeline.summary()
+
+
+# Exit codes for the command line renderer
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="payday_banner",
+        description="PAYDAY 2 assault banner generator. Run without arguments for the GUI.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    d = DEFAULT_CONFIG
+    render = sub.add_parser('render', help="render a banner to mp4/gif without the GUI")
+    render.add_argument('--text', default=d['custom_text'], help="banner text")
+    render.add_argument('--threat', type=int, default=1, choices=range(0, 11), metavar='0-10',
+        help="number of skulls (default: 1)")
+    render.add_argument('--color', default=d['color'], help="main color as #RRGGBB")
+    render.add_argument('--bg1', help="background pulse A color (default: derived from --color)")
+    render.add_argument('--bg2', help="background pulse B color (default: derived from --color)")
+    render.add_argument('--no-intro', action='store_true', help="skip the blinking intro animation")
+    render.add_argument('--intro-duration', type=float, default=d['start_flicker_duration'])
+    render.add_argument('--flicker-speed', type=float, default=d['bg_flicker_speed'],
+        help="background pulses per second, in steps of 0.1 (default: 1.0)")
+    render.add_argument('--width', type=int, default=d['canvas_width'])
+    render.add_argument('--height-mode', choices=['fit', 'fixed'], default=d['canvas_height_mode'])
+    render.add_argument('--padding', type=int, default=d['fit_padding'])
+    render.add_argument('--engine', choices=['numpy', 'pil'], default=d['render_engine'])
+    render.add_argument('--font', default=d['font'], help="font family, file name or path (default: fallback chain)")
+    render.add_argument('--fmt', choices=['mp4', 'gif'], default='mp4')
+    render.add_argument('--fps', type=int, default=60, help=f"frame rate (default: 60, GIFs top out at {GIF_MAX_FPS})")
+    render.add_argument('--duration', type=float, default=5.0, help="seconds (default: 5)")
+    render.add_argument('--auto-loop', action='store_true',
+        help="use the intro + one seamless loop as the duration")
+    render.add_argument('--loop-nudge', type=float, default=LOOP_NUDGE,
+        help=f"with --auto-loop, how much the scroll speed may change for a shorter loop "
+             f"(default: {LOOP_NUDGE}, 0 keeps it exact)")
+    render.add_argument('--workers', type=int, default=1, help="render processes (default: 1)")
+    render.add_argument('--out', help="output file (default: auto-named in exports/)")
+    render.add_argument('--progress', choices=['json', 'none'], default='json',
+        help="progress events as JSON lines on stdout (default: json)")
+    return parser
+
+
+def emit(enabled, event, **fields):
+    if enabled:
+        print(json.dumps({'event': event, **fields}), flush=True)
+
+
+def run_cli(argv):
+    """Entry point for `python -m payday_banner render ...`. Returns an exit code."""
+    parser = build_arg_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_USAGE
+    
+    json_progress = args.progress == 'json'
+    
+    config = dict(DEFAULT_CONFIG)
+    config.update({
+        'custom_text': args.text,
+        'threat_level': args.threat,
+        'color': args.color,
+        'start_flicker': not args.no_intro,
+        'start_flicker_duration': args.intro_duration,
+        'bg_flicker_speed': args.flicker_speed,
+        'canvas_width': args.width,
+        'canvas_height_mode': args.height_mode,
+        'fit_padding': args.padding,
+        'render_engine': args.engine,
+        'font': args.font,
+    })
+    for color in (args.color, args.bg1, args.bg2):
+        if color is not None and not re.fullmatch(r'#[0-9a-fA-F]{6}', color):
+            emit(json_progress, 'error', message=f"invalid color {color!r}, expected #RRGGBB")
+            return EXIT_USAGE
+    
+    config['bg_color_1'], config['bg_color_2'] = auto_bg_colors(args.color)
+    if args.bg1:
+        config['bg_color_1'] = args.bg1
+    if args.bg2:
+        config['bg_color_2'] = args.bg2
+    if args.width < 100 or args.fps < 1 or args.workers < 1:
+        emit(json_progress, 'error', message="--width must be >= 100, --fps and --workers >= 1")
+        return EXIT_USAGE
+    
+    renderer = BannerRenderer(config)
+    plan = renderer.compile_plan(args.width, args.height_mode, args.padding)
+    clock = export_clock(args.fmt, args.fps)
+    if args.auto_loop:
+        total_frames, plan, seamless = auto_loop_frames(plan, clock, args.loop_nudge)
+        if not seamless:
+            emit(json_progress, 'warning', message=f"loop is longer than {MAX_EXPORT_SECONDS}s, "
+                 f"cut at the limit so it won't loop seamlessly (a --loop-nudge gives shorter loops)")
+    else:
+        total_frames = clock.frame_count(args.duration)
+    if total_frames < 1:
+        emit(json_progress, 'error', message="duration is too short for a single frame")
+        return EXIT_USAGE
+    
+    filename = args.out
+    if not filename:
+        check_required_folders()
+        filename = os.path.join(EXPORTS_DIR, generate_export_filename(args.text, args.fmt))
+    
+    emit(json_progress, 'start', path=filename, frames=total_frames, fps=clock.fps,
+        width=plan.canvas_width, height=plan.canvas_height)
+    
+    # Progress events are throttled to ~10 per second
+    last_emit = [0.0]
+    start = time.perf_counter()
+    tracker = ExportProgress(total_frames)
+    
+    def on_progress(done, total):
+        tracker(done, total)
+        now = time.perf_counter()
+        if done == total or now - last_emit[0] >= 0.1:
+            last_emit[0] = now
+            _, _, fps, eta = tracker.snapshot()
+            emit(json_progress, 'progress', frame=done, total=total, render_fps=round(fps, 1),
+                eta=round(eta, 1) if eta is not None else None)
+    
+    try:
+        stages = export_banner(renderer, plan, filename, args.fmt, args.fps, total_frames, args.workers, on_progress)
+    except KeyboardInterrupt:
+        emit(json_progress, 'error', message="interrupted")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        emit(json_progress, 'error', message=str(e))
+        return EXIT_ERROR
+    
+    emit(json_progress, 'done', path=filename, frames=total_frames,
+        seconds=round(time.perf_counter() - start, 3), stages=stages)
+    return EXIT_OK
+
+
+# Time spent importing this module (see the startup timing report in payday_gui)
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv == ['--startup-timing']:
+        os.environ['PAYDAY_STARTUP_TIMING'] = '1'
+    elif argv:
+        return run_cli(argv)
+    
+    # No arguments: start the GUI (only now is tkinter imported)
+    from payday_gui import run_gui
+    run_gui()
+    return EXIT_OK
 
 
 if __name__ == "__main__":
-    # Check for required folders before starting
-    success, error_msg = check_required_folders()
-    
-    if not success:
-        # Show error dialog and exit
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
-        messagebox.showerror("Startup Error", error_msg)
-        root.destroy()
-        sys.exit(1)
-    
-    root = tk.Tk()
-    app = PaydayApp(root)
-    root.mainloop()
+    # Let `import payday_banner` (from payday_gui) reuse this module instead
+    # of loading and running it a second time
+    sys.modules.setdefault('payday_banner', sys.modules[__name__])
+    sys.exit(main())
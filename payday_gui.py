@@ -0,0 +1,1160 @@
+import time
+_IMPORT_START = time.perf_counter()
+
+import tkinter as tk
+from tkinter import ttk, colorchooser, filedialog, messagebox
+from PIL import ImageTk
+import threading
+import os
+import sys
+from contextlib import contextmanager
+
+import payday_banner
+from payday_banner import (
+    BannerRenderer, DEFAULT_CONFIG, EXPORTS_DIR, LOOP_NUDGE, MAX_EXPORT_SECONDS,
+    auto_bg_colors, auto_loop_frames, check_required_folders,
+    export_banner, export_clock, generate_export_filename, get_font_registry,
+    ExportProgress, TEXT_KEYS, TIMING_KEYS,
+)
+
+# Time spent importing tkinter & co. (payday_banner's own import time is
+# reported separately)
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+
+DEFAULT_FONT_LABEL = "(Default)"
+
+# Quiet time after the last edit before the preview picks up a config change
+CONFIG_DEBOUNCE_MS = 150
+
+# Preview frame rate, and how often the Tk side checks for a finished frame
+PREVIEW_FPS = 30
+PREVIEW_POLL_MS = 8
+
+# How often the export dialog reads the export's progress (~10 Hz)
+EXPORT_POLL_MS = 100
+
+
+class StartupTimer:
+    """
+    Startup timing report, enabled with PAYDAY_STARTUP_TIMING=1 or
+    `python payday_banner.py --startup-timing`. Collects how long each
+    startup phase took (and how many times it ran) and prints the breakdown
+    to stderr once the first preview frame is on the canvas.
+    """
+    def __init__(self):
+        self.enabled = bool(os.environ.get('PAYDAY_STARTUP_TIMING'))
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.reported = False
+    
+    def add(self, name, seconds):
+        total, count = self.phases.get(name, (0.0, 0))
+        self.phases[name] = (total + seconds, count + 1)
+    
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if not self.reported:
+                self.add(name, time.perf_counter() - start)
+    
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        if not self.enabled:
+            return
+        
+        lines = ["Startup timing:"]
+        lines.append(f"  {'import payday_banner':<40} {payday_banner.IMPORT_SECONDS * 1000:8.1f} ms")
+        lines.append(f"  {'import tkinter / GUI modules':<40} {IMPORT_SECONDS * 1000:8.1f} ms")
+        for name, (total, count) in self.phases.items():
+            runs = f" (x{count})" if count > 1 else ""
+            lines.append(f"  {name + runs:<40} {total * 1000:8.1f} ms")
+        lines.append(f"  {'PaydayApp start -> first preview frame':<40} {(time.perf_counter() - self.start) * 1000:8.1f} ms")
+        print("\n".join(lines), file=sys.stderr)
+
+
+# Dark and light theme defs
+THEMES = {
+    'dark': {
+        'bg': '#1a1a1a',
+        'bg_secondary': '#252525',
+        'bg_tertiary': '#2d2d2d',
+        'fg': '#e0e0e0',
+        'fg_dim': '#888888',
+        'accent': '#FFEF00',
+        'accent_dark': '#C4B500',
+        'accent_hover': '#FFE500',
+        'border': '#3d3d3d',
+        'entry_bg': '#1f1f1f',
+        'button_bg': '#333333',
+        'button_hover': '#404040',
+        'preview_bg': '#0a0a0a',
+        'section_header': '#FFEF00',
+    },
+    'light': {
+        'bg': '#f0f0f0',
+        'bg_secondary': '#ffffff',
+        'bg_tertiary': '#e8e8e8',
+        'fg': '#1a1a1a',
+        'fg_dim': '#666666',
+        'accent': '#C4A000',
+        'accent_dark': '#8B7500',
+        'accent_hover': '#DAAE00',
+        'border': '#cccccc',
+        'entry_bg': '#ffffff',
+        'button_bg': '#e0e0e0',
+        'button_hover': '#d0d0d0',
+        'preview_bg': '#2a2a2a',
+        'section_header': '#8B7500',
+    }
+}
+
+
+class PreviewRenderer(threading.Thread):
+    """
+    Renders preview frames on a background thread so a slow frame never
+    holds up Tk. Frames are due on a fixed wall-clock grid of 1/fps; one that
+    finishes late drops the slots it overran instead of queueing catch-up
+    frames. Each finished frame is a new image handed over through a
+    single latest-frame slot (front), which the main thread empties with
+    take(); a frame Tk hasn't taken yet is simply replaced by the newer one,
+    so a stale frame is never shown.
+    """
+    def __init__(self, fps=PREVIEW_FPS):
+        super().__init__(daemon=True)
+        self.frame_interval = 1.0 / fps
+        self.start_time = time.perf_counter()
+        self.renderer = None
+        self.plan = None
+        self.lock = threading.Lock()
+        self.front = None  # (image, render_seconds)
+        self.dropped = 0
+        self.wake = threading.Event()
+        self.stopped = False
+    
+    def set_source(self, renderer, plan):
+        """Render with a new renderer/plan from the next frame on (and draw that frame now)."""
+        with self.lock:
+            self.renderer, self.plan = renderer, plan
+        self.wake.set()
+    
+    def restart(self):
+        self.start_time = time.perf_counter()
+        self.wake.set()
+    
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
+    
+    def take(self):
+        """Newest finished frame as (image, render_seconds), or None if there's nothing new."""
+        with self.lock:
+            front, self.front = self.front, None
+        return front
+    
+    def run(self):
+        next_due = time.perf_counter()
+        while not self.stopped:
+            with self.lock:
+                renderer, plan = self.renderer, self.plan
+            
+            if plan is not None:
+                started = time.perf_counter()
+                try:
+                    image = renderer.render([started - self.start_time], plan)[0]
+                except:
+                    image = None  # Silently ignore errors during animation
+                if image is not None:
+                    with self.lock:
+                        self.front = (image, time.perf_counter() - started)
+            
+            # Move on to the next slot still ahead of us; any we overran are dropped
+            now = time.perf_counter()
+            if next_due <= now:
+                missed = int((now - next_due) / self.frame_interval)
+                self.dropped += missed
+                next_due += (missed + 1) * self.frame_interval
+            if self.wake.wait(next_due - now):
+                self.wake.clear()
+
+
+class PreviewStats:
+    """Numbers for the preview stats overlay, summarised every STATS_INTERVAL seconds."""
+    STATS_INTERVAL = 0.5
+    
+    def __init__(self):
+        self.allocations = 0  # Tk images and canvas items created for the preview
+        self.text = ""
+        self.reset()
+    
+    def reset(self):
+        self.window_start = time.perf_counter()
+        self.frames = 0
+        self.tick_total = 0.0
+        self.render_total = 0.0
+    
+    def add_frame(self, tick_seconds, render_seconds, dropped):
+        """Count a displayed frame. True when the summary text was refreshed."""
+        self.frames += 1
+        self.tick_total += tick_seconds
+        self.render_total += render_seconds
+        
+        elapsed = time.perf_counter() - self.window_start
+        if elapsed < self.STATS_INTERVAL:
+            return False
+        self.text = (f"{self.frames / elapsed:.0f} fps  |  tick {self.tick_total / self.frames * 1000:.2f} ms  |  "
+                     f"render {self.render_total / self.frames * 1000:.2f} ms  |  "
+                     f"dropped {dropped}  |  allocs {self.allocations}")
+        self.reset()
+        return True
+
+
+class PaydayApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("PAYDAY 2 — Assault Banner Generator")
+        self.root.geometry("1280x800")
+        self.root.minsize(1000, 700)
+        
+        # Theme state
+        self.current_theme = 'dark'
+        self.theme = THEMES[self.current_theme]
+        
+        self.config = dict(DEFAULT_CONFIG)
+        self.timer = StartupTimer()
+        self.apply_job = None
+        
+        self.rebuild_renderer()
+        self.preview_running = True
+        self.preview = PreviewRenderer()
+        self.preview.start()
+        self.preview_stats = PreviewStats()
+        
+        with self.timer.measure("setup_styles + build_ui"):
+            self.setup_styles()
+            self.build_ui()
+        self.animate_preview()
+        
+        # Handle window close
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        self.preview_running = False
+        self.preview.stop()
+        self.root.destroy()
+
+    def setup_styles(self):
+        """Configure ttk styles for the current theme."""
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        t = self.theme
+        
+        # Configure root
+        self.root.configure(bg=t['bg'])
+        
+        # Frame styles
+        self.style.configure('TFrame', background=t['bg'])
+        self.style.configure('Secondary.TFrame', background=t['bg_secondary'])
+        self.style.configure('Card.TFrame', background=t['bg_secondary'])
+        
+        # Label styles
+        self.style.configure('TLabel', 
+            background=t['bg_secondary'], 
+            foreground=t['fg'],
+            font=('Segoe UI', 10))
+        self.style.configure('Header.TLabel',
+            background=t['bg'],
+            foreground=t['accent'],
+            font=('Segoe UI', 14, 'bold'))
+        self.style.configure('Section.TLabel',
+            background=t['bg_secondary'],
+            foreground=t['section_header'],
+            font=('Segoe UI', 11, 'bold'))
+        self.style.configure('Dim.TLabel',
+            background=t['bg_secondary'],
+            foreground=t['fg_dim'],
+            font=('Segoe UI', 9))
+            
+        # Entry styles
+        self.style.configure('TEntry',
+            fieldbackground=t['entry_bg'],
+            foreground=t['fg'],
+            insertcolor=t['fg'],
+            borderwidth=1)
+        self.style.map('TEntry',
+            fieldbackground=[('focus', t['entry_bg'])],
+            bordercolor=[('focus', t['accent'])])
+            
+        # Combobox styles
+        self.style.configure('TCombobox',
+            fieldbackground=t['entry_bg'],
+            background=t['button_bg'],
+            foreground=t['fg'],
+            arrowcolor=t['accent'])
+        self.style.map('TCombobox',
+            fieldbackground=[('readonly', t['entry_bg'])],
+            selectbackground=[('readonly', t['accent'])],
+            selectforeground=[('readonly', t['bg'])])
+            
+        # Button styles
+        self.style.configure('TButton',
+            background=t['button_bg'],
+            foreground=t['fg'],
+            font=('Segoe UI', 10),
+            padding=(12, 6))
+        self.style.map('TButton',
+            background=[('active', t['button_hover']), ('pressed', t['accent_dark'])],
+            foreground=[('active', t['fg'])])
+            
+        # Accent button
+        self.style.configure('Accent.TButton',
+            background=t['accent'],
+            foreground='#000000',
+            font=('Segoe UI', 11, 'bold'),
+            padding=(20, 10))
+        self.style.map('Accent.TButton',
+            background=[('active', t['accent_hover']), ('pressed', t['accent_dark'])])
+            
+        # Checkbutton
+        self.style.configure('TCheckbutton',
+            background=t['bg_secondary'],
+            foreground=t['fg'],
+            font=('Segoe UI', 10))
+        self.style.map('TCheckbutton',
+            background=[('active', t['bg_secondary'])])
+            
+        # Radiobutton
+        self.style.configure('TRadiobutton',
+            background=t['bg_secondary'],
+            foreground=t['fg'],
+            font=('Segoe UI', 10))
+        self.style.map('TRadiobutton',
+            background=[('active', t['bg_secondary'])])
+            
+        # Scale
+        self.style.configure('TScale',
+            background=t['bg_secondary'],
+            troughcolor=t['bg_tertiary'])
+            
+        # Spinbox
+        self.style.configure('TSpinbox',
+            fieldbackground=t['entry_bg'],
+            background=t['button_bg'],
+            foreground=t['fg'],
+            arrowcolor=t['accent'])
+            
+        # Progressbar
+        self.style.configure('TProgressbar',
+            background=t['accent'],
+            troughcolor=t['bg_tertiary'])
+        
+    def build_ui(self):
+        """Build the main UI layout."""
+        t = self.theme
+        
+        # Header bar
+        header = ttk.Frame(self.root, style='TFrame')
+        header.pack(fill='x', padx=15, pady=(15, 10))
+        
+        # Title with Payday styling
+        title_frame = ttk.Frame(header, style='TFrame')
+        title_frame.pack(side='left')
+        
+        title_lbl = tk.Label(header, 
+            text="◢ PAYDAY 2 — ASSAULT BANNER GENERATOR ◣",
+            bg=t['bg'], 
+            fg=t['accent'],
+            font=('Segoe UI', 16, 'bold'))
+        title_lbl.pack(side='left')
+        
+        # Theme toggle
+        theme_frame = ttk.Frame(header, style='TFrame')
+        theme_frame.pack(side='right')
+        
+        self.theme_var = tk.StringVar(value=self.current_theme)
+        
+        dark_rb = ttk.Radiobutton(theme_frame, text="◐ Dark", 
+            variable=self.theme_var, value='dark',
+            command=self.toggle_theme)
+        dark_rb.pack(side='left', padx=5)
+        
+        light_rb = ttk.Radiobutton(theme_frame, text="◑ Light",
+            variable=self.theme_var, value='light', 
+            command=self.toggle_theme)
+        light_rb.pack(side='left', padx=5)
+        
+        # Main content area (Side by Side)
+        main_container = ttk.Frame(self.root, style='TFrame')
+        main_container.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+        
+        # Left panel - Controls (scrollable)
+        left_panel = ttk.Frame(main_container, style='TFrame')
+        left_panel.pack(side='left', fill='y', padx=(0, 10))
+        
+        # Create scrollable canvas for controls
+        controls_canvas = tk.Canvas(left_panel, bg=t['bg'], 
+            highlightthickness=0, width=380)
+        controls_scrollbar = ttk.Scrollbar(left_panel, orient='vertical',
+            command=controls_canvas.yview)
+        self.controls_frame = ttk.Frame(controls_canvas, style='TFrame')
+        
+        self.controls_frame.bind('<Configure>', 
+            lambda e: controls_canvas.configure(scrollregion=controls_canvas.bbox('all')))
+        controls_canvas.create_window((0, 0), window=self.controls_frame, anchor='nw')
+        controls_canvas.configure(yscrollcommand=controls_scrollbar.set)
+        
+        controls_canvas.pack(side='left', fill='both', expand=True)
+        controls_scrollbar.pack(side='right', fill='y')
+        
+        # Enable mousewheel scrolling
+        def on_mousewheel(event):
+            controls_canvas.yview_scroll(int(-1*(event.delta/120)), 'units')
+        controls_canvas.bind_all('<MouseWheel>', on_mousewheel)
+        
+        # Build control sections
+        self.build_banner_section()
+        self.build_color_section()
+        self.build_animation_section()
+        self.build_canvas_section()
+        self.build_export_section()
+        
+        # Right panel (preview)
+        right_panel = ttk.Frame(main_container, style='Secondary.TFrame')
+        right_panel.pack(side='right', fill='both', expand=True)
+        
+        self.build_preview_section(right_panel)
+        
+    def create_section(self, parent, title, icon=""):
+        """Create a styled section card."""
+        t = self.theme
+        
+        # Card container
+        card = tk.Frame(parent, bg=t['bg_secondary'], 
+            highlightbackground=t['border'], highlightthickness=1)
+        card.pack(fill='x', pady=(0, 10))
+        
+        # Section header
+        header = tk.Frame(card, bg=t['bg_secondary'])
+        header.pack(fill='x', padx=12, pady=(10, 5))
+        
+        tk.Label(header, text=f"{icon} {title}",
+            bg=t['bg_secondary'], fg=t['section_header'],
+            font=('Segoe UI', 11, 'bold')).pack(side='left')
+        
+        # Content frame
+        content = ttk.Frame(card, style='Secondary.TFrame')
+        content.pack(fill='x', padx=12, pady=(0, 12))
+        
+        return content
+        
+    def build_banner_section(self):
+        """Build the Banner Content section."""
+        content = self.create_section(self.controls_frame, "BANNER CONTENT", "▶")
+        
+        # Text input
+        ttk.Label(content, text="Banner Text").pack(anchor='w')
+        self.text_var = tk.StringVar(value=self.config['custom_text'])
+        self.text_var.trace('w', self.update_config)
+        text_entry = ttk.Entry(content, textvariable=self.text_var, width=45)
+        text_entry.pack(fill='x', pady=(2, 10))
+        
+        # Threat level
+        ttk.Label(content, text="Threat Level").pack(anchor='w')
+        self.threat_var = tk.StringVar(value=self.config['threat_level'])
+        self.threat_var.trace('w', self.update_config)
+        threat_levels = [
+            "Easy (0 skulls)", "Normal (1 skull)", "Hard (2 skulls)", "Overkill (3 skulls)",
+            "Mayhem (4 skulls)", "Death Wish (5 skulls)", "Death Sentence (6 skulls)",
+            "Juggernaut (7 skulls)", "Apocalypse (8 skulls)", "Cataclysmic (9 skulls)",
+            "Armageddon (10 skulls)"
+        ]
+        threat_combo = ttk.Combobox(content, textvariable=self.threat_var,
+            values=threat_levels, state='readonly', width=30)
+        threat_combo.pack(fill='x', pady=(2, 10))
+        
+        # Font - installed families from the font index, or type a file name/path
+        ttk.Label(content, text="Font").pack(anchor='w')
+        self.font_var = tk.StringVar(value=self.config['font'] or DEFAULT_FONT_LABEL)
+        self.font_var.trace('w', self.update_config)
+        font_combo = ttk.Combobox(content, textvariable=self.font_var,
+            values=[DEFAULT_FONT_LABEL] + get_font_registry().families(), width=30)
+        font_combo.pack(fill='x', pady=(2, 0))
+        
+    def build_color_section(self):
+        """Build the Color Scheme section."""
+        t = self.theme
+        content = self.create_section(self.controls_frame, "COLOR SCHEME", "◆")
+        
+        # Helper to convert hex to RGB and back
+        def hex_to_rgb(hex_color):
+            return tuple(int(hex_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+        
+        def rgb_to_hex(rgb):
+            return '#{:02x}{:02x}{:02x}'.format(*rgb)
+        
+        def darken_color(hex_color, factor):
+            """Darken a color by a factor (0.0 to 1.0)."""
+            r, g, b = hex_to_rgb(hex_color)
+            return rgb_to_hex((int(r * factor), int(g * factor), int(b * factor)))
+        
+        def create_color_row(parent, label, config_key, initial_color, is_bg=False):
+            row = ttk.Frame(parent, style='Secondary.TFrame')
+            row.pack(fill='x', pady=3)
+            
+            ttk.Label(row, text=label, width=12).pack(side='left')
+            
+            # Color swatch button
+            btn = tk.Button(row, width=8, height=1,
+                bg=initial_color, activebackground=initial_color,
+                relief='solid', borderwidth=1,
+                cursor='hand2')
+            btn.pack(side='left', padx=(5, 10))
+            
+            # Hex label
+            hex_lbl = tk.Label(row, text=initial_color,
+                bg=t['bg_secondary'], fg=t['fg_dim'],
+                font=('Consolas', 9))
+            hex_lbl.pack(side='left')
+            
+            def choose():
+                # If this is a BG color and auto_bg_color is enabled, don't allow choosing
+                if is_bg and self.auto_bg_var.get():
+                    messagebox.showinfo("Auto BG Enabled", 
+                        "Disable 'Auto BG from Main' to manually set background colors.")
+                    return
+                    
+                color = colorchooser.askcolor(color=self.config[config_key])[1]
+                if color:
+                    self.config[config_key] = color
+                    btn.config(bg=color, activebackground=color)
+                    hex_lbl.config(text=color)
+                    
+                    # If this is the main color and auto-BG is enabled, update BG colors
+                    if config_key == 'color' and self.auto_bg_var.get():
+                        self.auto_generate_bg_colors()
+                    
+                    self.apply_config()
+            
+            btn.config(command=choose)
+            return btn, hex_lbl, row
+        
+        # Main color row with auto-BG checkbox
+        main_row = ttk.Frame(content, style='Secondary.TFrame')
+        main_row.pack(fill='x', pady=3)
+        
+        ttk.Label(main_row, text="Main Color", width=12).pack(side='left')
+        
+        self.color_btn = tk.Button(main_row, width=8, height=1,
+            bg=self.config['color'], activebackground=self.config['color'],
+            relief='solid', borderwidth=1, cursor='hand2')
+        self.color_btn.pack(side='left', padx=(5, 10))
+        
+        self.color_lbl = tk.Label(main_row, text=self.config['color'],
+            bg=t['bg_secondary'], fg=t['fg_dim'], font=('Consolas', 9))
+        self.color_lbl.pack(side='left')
+        
+        def choose_main_color():
+            color = colorchooser.askcolor(color=self.config['color'])[1]
+            if color:
+                self.config['color'] = color
+                self.color_btn.config(bg=color, activebackground=color)
+                self.color_lbl.config(text=color)
+                
+                # If auto-BG is enabled, update BG colors
+                if self.auto_bg_var.get():
+                    self.auto_generate_bg_colors()
+                
+                self.apply_config()
+        
+        self.color_btn.config(command=choose_main_color)
+        
+        # Auto-generate BG checkbox
+        auto_row = ttk.Frame(content, style='Secondary.TFrame')
+        auto_row.pack(fill='x', pady=(5, 3))
+        
+        self.auto_bg_var = tk.BooleanVar(value=self.config.get('auto_bg_color', True))
+        auto_cb = ttk.Checkbutton(auto_row, text="Auto BG from Main",
+            variable=self.auto_bg_var, command=self.on_auto_bg_toggle)
+        auto_cb.pack(side='left')
+        
+        ttk.Label(auto_row, text="(auto-generates flicker colors)", 
+            style='Dim.TLabel').pack(side='left', padx=(5, 0))
+        
+        # Background color rows
+        self.bg_c1_btn, self.bg_c1_lbl, self.bg_c1_row = create_color_row(
+            content, "BG Pulse A", 'bg_color_1', self.config['bg_color_1'], is_bg=True)
+        self.bg_c2_btn, self.bg_c2_lbl, self.bg_c2_row = create_color_row(
+            content, "BG Pulse B", 'bg_color_2', self.config['bg_color_2'], is_bg=True)
+        
+        # Apply initial auto-generate if enabled
+        if self.auto_bg_var.get():
+            self.auto_generate_bg_colors()
+        self.update_bg_button_states()
+    
+    def auto_generate_bg_colors(self):
+        """Generate background flicker colors from main color."""
+        bg1_hex, bg2_hex = auto_bg_colors(self.config['color'])
+        
+        self.config['bg_color_1'] = bg1_hex
+        self.config['bg_color_2'] = bg2_hex
+        
+        # Update UI
+        self.bg_c1_btn.config(bg=bg1_hex, activebackground=bg1_hex)
+        self.bg_c1_lbl.config(text=bg1_hex)
+        self.bg_c2_btn.config(bg=bg2_hex, activebackground=bg2_hex)
+        self.bg_c2_lbl.config(text=bg2_hex)
+        
+        self.apply_config()
+    
+    def on_auto_bg_toggle(self):
+        """Handle auto-BG checkbox toggle."""
+        self.config['auto_bg_color'] = self.auto_bg_var.get()
+        if self.auto_bg_var.get():
+            self.auto_generate_bg_colors()
+        self.update_bg_button_states()
+    
+    def update_bg_button_states(self):
+        """Enable/disable background color buttons based on auto-BG setting."""
+        if self.auto_bg_var.get():
+            # Disable buttons - make them look inactive
+            self.bg_c1_btn.config(state='disabled', cursor='arrow')
+            self.bg_c2_btn.config(state='disabled', cursor='arrow')
+        else:
+            # Enable buttons
+            self.bg_c1_btn.config(state='normal', cursor='hand2')
+            self.bg_c2_btn.config(state='normal', cursor='hand2')
+
+    def build_animation_section(self):
+        """Build the Animation section."""
+        t = self.theme
+        content = self.create_section(self.controls_frame, "ANIMATION", "⚡")
+        
+        # Start flicker checkbox
+        self.flicker_var = tk.BooleanVar(value=self.config['start_flicker'])
+        self.flicker_var.trace('w', self.update_config)
+        flicker_cb = ttk.Checkbutton(content, text="Enable Start Flicker Animation",
+            variable=self.flicker_var)
+        flicker_cb.pack(anchor='w', pady=(0, 5))
+        
+        # Flicker duration slider
+        flicker_dur_frame = ttk.Frame(content, style='Secondary.TFrame')
+        flicker_dur_frame.pack(fill='x', pady=(0, 10))
+        
+        ttk.Label(flicker_dur_frame, text="Flicker Duration (s)", width=16).pack(side='left')
+        
+        self.flicker_dur_var = tk.DoubleVar(value=self.config['start_flicker_duration'])
+        self.flicker_dur_var.trace('w', self.update_config)
+        
+        flicker_dur_spin = ttk.Spinbox(flicker_dur_frame, from_=0.5, to=10.0,
+            textvariable=self.flicker_dur_var, width=6, increment=0.5)
+        flicker_dur_spin.pack(side='left', padx=(5, 0))
+        
+        self.flicker_dur_lbl = tk.Label(flicker_dur_frame, text="sec",
+            bg=t['bg_secondary'], fg=t['fg_dim'],
+            font=('Segoe UI', 9))
+        self.flicker_dur_lbl.pack(side='left', padx=(5, 0))
+        
+        # Speed slider with value label
+        speed_frame = ttk.Frame(content, style='Secondary.TFrame')
+        speed_frame.pack(fill='x')
+        
+        ttk.Label(speed_frame, text="BG Flicker Speed").pack(anchor='w')
+        
+        slider_row = ttk.Frame(speed_frame, style='Secondary.TFrame')
+        slider_row.pack(fill='x', pady=(2, 0))
+        
+        self.speed_var = tk.DoubleVar(value=self.config['bg_flicker_speed'])
+        self.speed_var.trace('w', self.update_config)
+        
+        speed_slider = ttk.Scale(slider_row, from_=0.0, to=5.0,
+            variable=self.speed_var, length=250)
+        speed_slider.pack(side='left', fill='x', expand=True)
+        
+        self.speed_lbl = tk.Label(slider_row, text=f"{self.config['bg_flicker_speed']:.1f}x",
+            bg=t['bg_secondary'], fg=t['accent'],
+            font=('Consolas', 10, 'bold'), width=5)
+        self.speed_lbl.pack(side='right', padx=(10, 0))
+        
+        # Update speed label when slider changes
+        def update_speed_label(*args):
+            try:
+                self.speed_lbl.config(text=f"{self.speed_var.get():.1f}x")
+            except:
+                pass
+        self.speed_var.trace('w', update_speed_label)
+        
+    def build_canvas_section(self):
+        """Build the Canvas Settings section."""
+        content = self.create_section(self.controls_frame, "CANVAS OUTPUT", "▣")
+        
+        # Width
+        width_row = ttk.Frame(content, style='Secondary.TFrame')
+        width_row.pack(fill='x', pady=(0, 8))
+        
+        ttk.Label(width_row, text="Width (px)", width=12).pack(side='left')
+        self.width_var = tk.IntVar(value=self.config['canvas_width'])
+        self.width_var.trace('w', self.update_config)
+        width_spin = ttk.Spinbox(width_row, from_=300, to=4096,
+            textvariable=self.width_var, width=10)
+        width_spin.pack(side='left', padx=(5, 0))
+        
+        # Height mode
+        ttk.Label(content, text="Height Mode").pack(anchor='w')
+        mode_frame = ttk.Frame(content, style='Secondary.TFrame')
+        mode_frame.pack(fill='x', pady=(2, 8))
+        
+        self.height_mode_var = tk.StringVar(value=self.config['canvas_height_mode'])
+        self.height_mode_var.trace('w', self.update_config)
+        
+        ttk.Radiobutton(mode_frame, text="Fixed 1080p",
+            variable=self.height_mode_var, value='fixed').pack(side='left', padx=(0, 15))
+        ttk.Radiobutton(mode_frame, text="Fit to Banner",
+            variable=self.height_mode_var, value='fit').pack(side='left')
+        
+        # Padding
+        pad_row = ttk.Frame(content, style='Secondary.TFrame')
+        pad_row.pack(fill='x')
+        
+        ttk.Label(pad_row, text="Fit Padding", width=12).pack(side='left')
+        self.pad_var = tk.IntVar(value=self.config['fit_padding'])
+        self.pad_var.trace('w', self.update_config)
+        pad_spin = ttk.Spinbox(pad_row, from_=0, to=200,
+            textvariable=self.pad_var, width=10)
+        pad_spin.pack(side='left', padx=(5, 0))
+        
+        # Render engine
+        ttk.Label(content, text="Render Engine").pack(anchor='w', pady=(8, 0))
+        engine_frame = ttk.Frame(content, style='Secondary.TFrame')
+        engine_frame.pack(fill='x', pady=(2, 0))
+        
+        self.engine_var = tk.StringVar(value=self.config['render_engine'])
+        self.engine_var.trace('w', self.update_config)
+        
+        ttk.Radiobutton(engine_frame, text="NumPy (batched)",
+            variable=self.engine_var, value='numpy').pack(side='left', padx=(0, 15))
+        ttk.Radiobutton(engine_frame, text="PIL",
+            variable=self.engine_var, value='pil').pack(side='left')
+        
+    def build_export_section(self):
+        """Build the Export section."""
+        t = self.theme
+        content = self.create_section(self.controls_frame, "EXPORT", "◤")
+        
+        # Format and FPS row
+        row1 = ttk.Frame(content, style='Secondary.TFrame')
+        row1.pack(fill='x', pady=(0, 8))
+        
+        ttk.Label(row1, text="Format", width=12).pack(side='left')
+        self.format_var = tk.StringVar(value='mp4')
+        format_combo = ttk.Combobox(row1, textvariable=self.format_var,
+            values=['mp4', 'gif'], state='readonly', width=8)
+        format_combo.pack(side='left', padx=(5, 20))
+        format_combo.bind('<<ComboboxSelected>>', lambda e: self.update_est_duration())
+        
+        ttk.Label(row1, text="FPS").pack(side='left')
+        self.fps_var = tk.IntVar(value=60)
+        fps_spin = ttk.Spinbox(row1, from_=24, to=144,
+            textvariable=self.fps_var, width=6)
+        fps_spin.pack(side='left', padx=(5, 0))
+        # The auto loop is a whole number of frames, so it depends on the fps (and format)
+        self.fps_var.trace_add('write', lambda *args: self.update_est_duration())
+        
+        # Duration row
+        row2 = ttk.Frame(content, style='Secondary.TFrame')
+        row2.pack(fill='x', pady=(0, 8))
+        
+        ttk.Label(row2, text="Duration (s)", width=12).pack(side='left')
+        self.duration_var = tk.DoubleVar(value=5.0)
+        dur_spin = ttk.Spinbox(row2, from_=0.5, to=MAX_EXPORT_SECONDS,
+            textvariable=self.duration_var, width=8, increment=0.5)
+        dur_spin.pack(side='left', padx=(5, 20))
+        
+        ttk.Label(row2, text="Workers").pack(side='left')
+        self.workers_var = tk.IntVar(value=os.cpu_count() or 1)
+        workers_spin = ttk.Spinbox(row2, from_=1, to=max(os.cpu_count() or 1, 1),
+            textvariable=self.workers_var, width=4)
+        workers_spin.pack(side='left', padx=(5, 0))
+        
+        # Auto-calculate
+        auto_frame = ttk.Frame(content, style='Secondary.TFrame')
+        auto_frame.pack(fill='x', pady=(0, 12))
+        
+        self.auto_loop_var = tk.BooleanVar(value=False)
+        auto_cb = ttk.Checkbutton(auto_frame, text="Auto-calc GIF loop duration",
+            variable=self.auto_loop_var, command=self.update_est_duration)
+        auto_cb.pack(side='left')
+        
+        # Off keeps the scroll speed exact, at the cost of (much) longer loops
+        self.loop_nudge_var = tk.BooleanVar(value=True)
+        nudge_cb = ttk.Checkbutton(auto_frame, text=f"Nudge speed (±{LOOP_NUDGE:.0%})",
+            variable=self.loop_nudge_var, command=self.update_est_duration)
+        nudge_cb.pack(side='left', padx=(10, 0))
+        
+        self.est_dur_lbl = tk.Label(auto_frame, text="",
+            bg=t['bg_secondary'], fg=t['fg_dim'],
+            font=('Segoe UI', 9))
+        self.est_dur_lbl.pack(side='right')
+        
+        # Export button (prominent)
+        export_btn = ttk.Button(content, text="◢ EXPORT RENDER ◣",
+            style='Accent.TButton', command=self.start_export)
+        export_btn.pack(fill='x', pady=(5, 0))
+        
+    def build_preview_section(self, parent):
+        """Build the Preview panel."""
+        t = self.theme
+        
+        # Preview header
+        header = tk.Frame(parent, bg=t['bg_secondary'])
+        header.pack(fill='x', padx=15, pady=(15, 10))
+        
+        tk.Label(header, text="◆ LIVE PREVIEW",
+            bg=t['bg_secondary'], fg=t['section_header'],
+            font=('Segoe UI', 11, 'bold')).pack(side='left')
+        
+        # Replay button
+        replay_btn = ttk.Button(header, text="↺ Replay",
+            command=self.restart_anim)
+        replay_btn.pack(side='right')
+        
+        # Stats overlay toggle
+        self.stats_var = tk.BooleanVar(value=False)
+        stats_cb = ttk.Checkbutton(header, text="Stats",
+            variable=self.stats_var, command=self.toggle_stats)
+        stats_cb.pack(side='right', padx=(0, 10))
+        
+        # Preview canvas container
+        preview_container = tk.Frame(parent, bg=t['border'])
+        preview_container.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+        
+        self.preview_canvas = tk.Canvas(preview_container,
+            bg=t['preview_bg'], highlightthickness=0)
+        self.preview_canvas.pack(fill='both', expand=True, padx=2, pady=2)
+        
+        # Created on the first frame, then reused (see show_preview_frame)
+        self.tk_img = None
+        self.preview_item = None
+        self.preview_center = None
+        self.stats_item = None
+        
+    def toggle_theme(self):
+        """Switch between dark and light themes."""
+        self.current_theme = self.theme_var.get()
+        self.theme = THEMES[self.current_theme]
+        
+        # Rebuild UI with new theme
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        
+        self.setup_styles()
+        self.build_ui()
+        
+    def update_config(self, *args):
+        """Update configuration from UI variables."""
+        self.config['custom_text'] = self.text_var.get()
+        self.config['threat_level'] = self.threat_var.get()
+        font = self.font_var.get().strip()
+        self.config['font'] = '' if font == DEFAULT_FONT_LABEL else font
+        self.config['start_flicker'] = self.flicker_var.get()
+        try:
+            self.config['start_flicker_duration'] = self.flicker_dur_var.get()
+        except: pass
+        try:
+            self.config['bg_flicker_speed'] = self.speed_var.get()
+        except: pass
+        try:
+            self.config['canvas_width'] = self.width_var.get()
+        except: pass
+        self.config['canvas_height_mode'] = self.height_mode_var.get()
+        self.config['render_engine'] = self.engine_var.get()
+        try:
+            self.config['fit_padding'] = self.pad_var.get()
+        except: pass
+        
+        # Typing or dragging a slider fires this for every step, only apply
+        # the config once things settle
+        if self.apply_job is not None:
+            self.root.after_cancel(self.apply_job)
+        self.apply_job = self.root.after(CONFIG_DEBOUNCE_MS, self.apply_config)
+    
+    def apply_config(self):
+        """Bring the renderer and preview plan up to date, redoing only what the changed keys affect."""
+        if self.apply_job is not None:
+            self.root.after_cancel(self.apply_job)
+            self.apply_job = None
+        
+        changed = self.renderer.update_config(self.config)
+        if not changed:
+            return
+        self.plan = self.renderer.update_plan(self.plan, changed)
+        if self.preview_plan is not None:
+            self.preview_plan = self.renderer.update_plan(self.preview_plan, changed)
+        if changed & (TEXT_KEYS | TIMING_KEYS):
+            self.update_est_duration()
+
+    def rebuild_renderer(self):
+        """Recreate the renderer and recompile the preview plan from the current config."""
+        with self.timer.measure("BannerRenderer.__init__ (font lookup)"):
+            self.renderer = BannerRenderer(self.config)
+        with self.timer.measure("compile_plan"):
+            self.plan = self.renderer.compile_plan(
+                self.config.get('canvas_width', 1920),
+                self.config.get('canvas_height_mode', 'fixed'),
+                self.config.get('fit_padding', 50))
+        self.preview_plan = None
+
+    def update_est_duration(self):
+        """Update the estimated duration label based on animation settings."""
+        if not self.auto_loop_var.get():
+            self.est_dur_lbl.config(text="")
+            return
+        try:
+            fps = self.fps_var.get()
+        except:
+            return  # fps box is mid-edit
+        if fps < 1:
+            return
+        
+        clock = export_clock(self.format_var.get(), fps)
+        total_frames, plan, seamless = auto_loop_frames(self.plan, clock, self.loop_nudge())
+        total = clock.time(total_frames)
+        if not seamless:
+            hint = f"{total:.0f}s limit, {total_frames} frames (loop too long, won't be seamless)"
+        elif self.config['start_flicker']:
+            hint = f"≈ {total:.2f}s, {total_frames} frames (intro + loop)"
+        else:
+            hint = f"≈ {total:.2f}s, {total_frames} frames (loop only)"
+        if plan.scroll_speed != self.plan.scroll_speed:
+            # The export scrolls at this speed, the preview doesn't
+            hint += f", scroll {float(plan.scroll_speed):.1f} px/s (preview {float(self.plan.scroll_speed):.1f})"
+        
+        self.est_dur_lbl.config(text=hint)
+        self.duration_var.set(round(total, 2))
+
+    def loop_nudge(self):
+        """How much the auto loop may change the scroll speed (see solve_loop)."""
+        return LOOP_NUDGE if self.loop_nudge_var.get() else 0.0
+
+    def restart_anim(self):
+        """Restart the preview animation."""
+        self.preview.restart()
+
+    def show_preview_frame(self, pil_img, canvas_w, canvas_h):
+        """
+        Put a frame on the preview canvas. The Tk image and canvas item are
+        made once and the pixels pasted in; the image is only recreated when
+        the preview size changes.
+        """
+        canvas = self.preview_canvas
+        if self.tk_img is None or (self.tk_img.width(), self.tk_img.height()) != pil_img.size:
+            self.tk_img = ImageTk.PhotoImage(pil_img)
+            self.preview_stats.allocations += 1
+            if self.preview_item is None:
+                self.preview_item = canvas.create_image(0, 0, image=self.tk_img)
+                self.preview_stats.allocations += 1
+                if self.stats_item is not None:
+                    canvas.tag_raise(self.stats_item)
+            else:
+                canvas.itemconfig(self.preview_item, image=self.tk_img)
+        else:
+            self.tk_img.paste(pil_img)
+        
+        center = (canvas_w // 2, canvas_h // 2)
+        if center != self.preview_center:
+            canvas.coords(self.preview_item, *center)
+            self.preview_center = center
+    
+    def toggle_stats(self):
+        """Show/hide the preview stats overlay."""
+        if not self.stats_var.get() and self.stats_item is not None:
+            self.preview_canvas.delete(self.stats_item)
+            self.stats_item = None
+        self.update_stats_overlay()
+    
+    def update_stats_overlay(self):
+        if not self.stats_var.get():
+            return
+        text = self.preview_stats.text or "collecting..."
+        if self.stats_item is None:
+            self.stats_item = self.preview_canvas.create_text(8, 8, anchor='nw', text=text,
+                fill=self.theme['fg_dim'], font=('Consolas', 9))
+        else:
+            self.preview_canvas.itemconfig(self.stats_item, text=text)
+
+    def animate_preview(self):
+        """
+        Keep the preview thread's plan in step with the config and canvas size,
+        and put its newest finished frame on the canvas.
+        """
+        if not self.preview_running:
+            return
+        
+        try:
+            # Draw straight at the size it's shown at instead of full size + thumbnail
+            canvas_w = self.preview_canvas.winfo_width()
+            canvas_h = self.preview_canvas.winfo_height()
+            if canvas_w < 10: canvas_w = 800
+            if canvas_h < 10: canvas_h = 500
+            
+            plan = self.plan
+            scale = min((canvas_w - 20) / plan.canvas_width, (canvas_h - 20) / plan.canvas_height, 1.0)
+            if self.preview_plan is None or self.preview_plan.scale != scale:
+                self.preview_plan = self.renderer.compile_plan(
+                    plan.canvas_width, plan.height_mode, plan.padding, scale)
+            if self.preview.plan is not self.preview_plan:
+                self.preview.set_source(self.renderer, self.preview_plan)
+            
+            frame = self.preview.take()
+            if frame is not None:
+                pil_img, render_seconds = frame
+                tick_start = time.perf_counter()
+                self.show_preview_frame(pil_img, canvas_w, canvas_h)
+                if self.preview_stats.add_frame(time.perf_counter() - tick_start, render_seconds,
+                                                self.preview.dropped):
+                    self.update_stats_overlay()
+                
+                if not self.timer.reported:
+                    self.timer.add("first preview frame render", render_seconds)
+                    self.timer.report()
+        except Exception as e:
+            pass  # Silently ignore errors during animation
+        
+        self.root.after(PREVIEW_POLL_MS, self.animate_preview)
+
+    def start_export(self):
+        """Start the export process."""
+        self.apply_config()  # Don't leave an edit waiting on the debounce
+        fmt = self.format_var.get()
+        
+        # Ensure exports directory exists
+        if not os.path.isdir(EXPORTS_DIR):
+            try:
+                os.makedirs(EXPORTS_DIR, exist_ok=True)
+            except Exception as e:
+                messagebox.showerror("Export Error", f"Could not create exports folder:\n{e}")
+                return
+        
+        # Generate auto-filename suggestion
+        auto_filename = generate_export_filename(self.config['custom_text'], fmt)
+        default_path = os.path.join(EXPORTS_DIR, auto_filename)
+        
+        file_types = [("MP4 Video", "*.mp4")] if fmt == 'mp4' else [("GIF Image", "*.gif")]
+        filename = filedialog.asksaveasfilename(
+            initialdir=EXPORTS_DIR,
+            initialfile=auto_filename,
+            defaultextension=f".{fmt}",
+            filetypes=file_types
+        )
+        
+        if not filename:
+            return
+        
+        duration = self.duration_var.get()
+        fps = self.fps_var.get()
+        try:
+            workers = max(1, self.workers_var.get())
+        except:
+            workers = 1
+        
+        w = self.config.get('canvas_width', 1920)
+        hm = self.config.get('canvas_height_mode', 'fixed')
+        pad = self.config.get('fit_padding', 50)
+        # Own renderer for the export thread - the preview one keeps changing
+        # while the export runs
+        renderer = BannerRenderer(self.config)
+        plan = renderer.compile_plan(w, hm, pad)
+        clock = export_clock(fmt, fps)
+        if self.auto_loop_var.get():
+            # Exact frame count (and maybe nudged scroll speed) rather than the rounded seconds
+            total_frames, plan, _ = auto_loop_frames(plan, clock, self.loop_nudge())
+        else:
+            total_frames = clock.frame_count(duration)
+        
+        t = self.theme
+        
+        # Create progress dialog
+        top = tk.Toplevel(self.root)
+        top.title("Exporting...")
+        top.geometry("350x140")
+        top.configure(bg=t['bg_secondary'])
+        top.resizable(False, False)
+        top.transient(self.root)
+        top.grab_set()
+        
+        tk.Label(top, text="◢ RENDERING IN PROGRESS ◣",
+            bg=t['bg_secondary'], fg=t['accent'],
+            font=('Segoe UI', 12, 'bold')).pack(pady=(20, 10))
+        
+        progress = ttk.Progressbar(top, length=280, mode='determinate', maximum=total_frames)
+        progress.pack(pady=10)
+        
+        frame_lbl = tk.Label(top, text=f"0 / {total_frames} frames",
+            bg=t['bg_secondary'], fg=t['fg_dim'],
+            font=('Segoe UI', 9))
+        frame_lbl.pack()
+        
+        rate_lbl = tk.Label(top, text="",
+            bg=t['bg_secondary'], fg=t['fg_dim'],
+            font=('Segoe UI', 9))
+        rate_lbl.pack()
+        
+        # The export thread only updates this; all Tk calls stay on the main
+        # thread in poll_progress
+        tracker = ExportProgress(total_frames)
+        result = {}
+        
+        def run_render():
+            try:
+                export_banner(renderer, plan, filename, fmt, fps, total_frames, workers, tracker)
+            except Exception as e:
+                result['error'] = e
+        
+        export_thread = threading.Thread(target=run_render, daemon=True)
+        export_thread.start()
+        
+        def poll_progress():
+            done, total, rate, eta = tracker.snapshot()
+            progress['value'] = done
+            frame_lbl.config(text=f"{done} / {total} frames")
+            if done:
+                eta_text = f"{eta:.0f}s left" if eta is not None else ""
+                rate_lbl.config(text=f"{rate:.1f} fps  ·  {eta_text}")
+            
+            if export_thread.is_alive():
+                top.after(EXPORT_POLL_MS, poll_progress)
+                return
+            
+            top.destroy()
+            if 'error' in result:
+                messagebox.showerror("Export Error", str(result['error']))
+            else:
+                messagebox.showinfo("Export Complete", f"Successfully exported to:\n{filename}")
+        
+        poll_progress()
+
+
+def run_gui():
+    # Check for required folders before starting
+    success, error_msg = check_required_folders()
+    
+    if not success:
+        # Show error dialog and exit
+        root = tk.Tk()
+        root.withdraw()  # Hide the main window
+        messagebox.showerror("Startup Error", error_msg)
+        root.destroy()
+        sys.exit(1)
+    
+    root = tk.Tk()
+    app = PaydayApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    run_gui()